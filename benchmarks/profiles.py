@@ -0,0 +1,70 @@
+"""
+Startup cost and per-request overhead of the settings profiles.
+
+    python -m benchmarks.profiles
+
+Each profile runs in a fresh interpreter: startup is the time to
+``django.setup()``, load the URLconf and build the WSGI handler; the
+per-request figure calls that handler directly with a cached ``/times/date/``
+request, so it is almost entirely middleware and view dispatch.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import timeit
+
+PROFILES = ['prayer_api.settings', 'prayer_api.settings_api']
+PATH = '/api/v1/times/date/'
+QUERY = 'madhab=shafi&city=colombo&date=2026-09-23'
+
+
+def _child():
+    started = time.perf_counter()
+    import django
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import get_resolver
+
+    django.setup()
+    handler = get_wsgi_application()
+    get_resolver().url_patterns
+    startup = time.perf_counter() - started
+
+    from django.test import RequestFactory
+    environ = {**RequestFactory()._base_environ(), 'PATH_INFO': PATH, 'QUERY_STRING': QUERY}
+
+    def request():
+        response = handler(dict(environ), lambda status, headers: None)
+        assert response.status_code == 200, response.status_code
+        response.close()
+
+    request()
+    number = 2000
+    per_request = min(timeit.repeat(request, number=number, repeat=5)) / number
+    print(json.dumps({
+        'startup_ms': startup * 1000,
+        'request_us': per_request * 1e6,
+        'modules': len(sys.modules),
+        'middleware': len(django.conf.settings.MIDDLEWARE),
+    }))
+
+
+def main():
+    print(f"{'profile':<28}{'startup ms':>12}{'modules':>9}{'middleware':>12}{'request us':>12}")
+    for profile in PROFILES:
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.profiles', '--child'],
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': profile},
+            check=True, capture_output=True, text=True,
+        ).stdout
+        r = json.loads(out.splitlines()[-1])
+        print(f"{profile:<28}{r['startup_ms']:>12.1f}{r['modules']:>9}{r['middleware']:>12}"
+              f"{r['request_us']:>12.1f}")
+
+
+if __name__ == '__main__':
+    if '--child' in sys.argv:
+        _child()
+    else:
+        main()
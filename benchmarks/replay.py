@@ -0,0 +1,134 @@
+"""
+Traffic replay behind ``python manage.py replay_traffic``.
+
+A traffic file has one JSON object per recorded request::
+
+    {"ts": 1790171040.25, "method": "GET", "path": "/api/v1/times/next/",
+     "query": "madhab=shafi&city=colombo&datetime=2026-09-23T18:05"}
+
+``ts`` is the epoch second the request arrived; ``method`` defaults to GET
+and ``query`` to empty. POSTs may carry the JSON request ``body``.
+
+Requests are sent open-loop: each is due at its recorded offset divided by
+``speed`` (or every ``1/rps`` seconds), whether or not earlier responses
+have arrived, and latency is measured from that due time, so a saturated
+server shows up as latency rather than as a slower replay. ``concurrency``
+keep-alive connections share the load.
+"""
+import asyncio
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from . import servers
+
+
+@dataclass
+class Recorded:
+    ts: float
+    method: str
+    path: str
+    query: str = ''
+    body: Optional[bytes] = None
+
+    @property
+    def target(self) -> str:
+        return f'{self.path}?{self.query}' if self.query else self.path
+
+
+def read_traffic(lines: Iterable[str]) -> List[Recorded]:
+    """Parse a traffic file, skipping blank lines; sorted by timestamp."""
+    records = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            body = item.get('body')
+            records.append(Recorded(
+                ts=float(item['ts']),
+                method=item.get('method', 'GET').upper(),
+                path=item['path'],
+                query=item.get('query', ''),
+                body=None if body is None else json.dumps(body).encode(),
+            ))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f'line {number}: {e!r}') from None
+    records.sort(key=lambda r: r.ts)
+    return records
+
+
+def schedule(records: List[Recorded], speed: float = 1.0, rps: Optional[float] = None) -> List[float]:
+    """Offsets in seconds from the start of the replay at which each record is due."""
+    if rps:
+        return [i / rps for i in range(len(records))]
+    start = records[0].ts if records else 0.0
+    return [(r.ts - start) / speed for r in records]
+
+
+async def _worker(host: str, port: int, queue: asyncio.Queue, results: Dict[str, List]):
+    reader = writer = None
+    while True:
+        item = await queue.get()
+        if item is None:
+            break
+        due, record = item
+        try:
+            if writer is None or writer.is_closing():
+                reader, writer = await asyncio.open_connection(host, port)
+            status = await servers.http_request(
+                reader, writer, record.target, record.method, record.body or b'')
+        except (OSError, asyncio.IncompleteReadError):
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            status = None  # counted as an error
+        results[record.path].append((time.perf_counter() - due, status))
+    if writer is not None:
+        writer.close()
+
+
+async def _replay(url: str, records: List[Recorded], offsets: List[float], concurrency: int):
+    parts = urlsplit(url)
+    host, port = parts.hostname or '127.0.0.1', parts.port or 80
+    queue: asyncio.Queue = asyncio.Queue()
+    results: Dict[str, List] = defaultdict(list)
+    workers = [asyncio.create_task(_worker(host, port, queue, results)) for _ in range(concurrency)]
+
+    started = time.perf_counter()
+    for offset, record in zip(offsets, records):
+        due = started + offset
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        queue.put_nowait((due, record))
+    for _ in workers:
+        queue.put_nowait(None)
+    await asyncio.gather(*workers)
+    return results, time.perf_counter() - started
+
+
+def _summary(samples: List, elapsed: float) -> Dict[str, float]:
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if status is None or status >= 400)
+    return {
+        'requests': len(samples),
+        'rps': len(samples) / elapsed,
+        'error_rate': errors / len(samples),
+        'p50_ms': servers.percentile(latencies, 0.50) * 1000,
+        'p95_ms': servers.percentile(latencies, 0.95) * 1000,
+        'p99_ms': servers.percentile(latencies, 0.99) * 1000,
+    }
+
+
+def replay(url: str, records: List[Recorded], *, speed: float = 1.0, rps: Optional[float] = None,
+           concurrency: int = 32) -> Dict:
+    """Replay ``records`` against ``url``; returns per-endpoint and overall summaries."""
+    offsets = schedule(records, speed, rps)
+    results, elapsed = asyncio.run(_replay(url, records, offsets, concurrency))
+    report = {path: _summary(samples, elapsed) for path, samples in sorted(results.items())}
+    report['all'] = _summary([s for samples in results.values() for s in samples], elapsed)
+    return {'elapsed_s': elapsed, 'endpoints': report}
@@ -0,0 +1,51 @@
+"""
+Serializer + JSONRenderer versus the direct ``render_json`` path used by the
+times views.
+
+    python -m benchmarks.serialization
+"""
+import os
+import timeit
+from datetime import date
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prayer_api.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from times.responses import render_json  # noqa: E402
+from times.serializers import PrayerTimesRangeSerializer, PrayerTimesSerializer  # noqa: E402
+from times.utils import get_times_for_day, get_times_for_range  # noqa: E402
+
+
+def _per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    day = get_times_for_day(date(2026, 9, 23), 'shafi', 'colombo')
+    year = {
+        'start': '2026-01-01', 'end': '2026-12-31', 'madhab': 'shafi', 'city': 'colombo',
+        'results': get_times_for_range(date(2026, 1, 1), date(2026, 12, 31), 'shafi', 'colombo'),
+    }
+    renderer = JSONRenderer()
+
+    cases = [
+        ('date', 2000,
+         lambda: renderer.render(PrayerTimesSerializer(day).data),
+         lambda: render_json(day.as_payload())),
+        ('range 365d', 20,
+         lambda: renderer.render(PrayerTimesRangeSerializer(year).data),
+         lambda: render_json(year)),
+    ]
+    print(f"{'payload':<12}{'serializer (us)':>18}{'direct (us)':>14}{'speedup':>10}")
+    for name, number, old, new in cases:
+        assert old() == new(), name
+        before, after = _per_call_us(old, number), _per_call_us(new, number)
+        print(f'{name:<12}{before:>18.1f}{after:>14.1f}{before / after:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
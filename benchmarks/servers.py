@@ -0,0 +1,189 @@
+"""
+Throughput of the sync DRF views under gunicorn versus the async views
+under uvicorn, with many concurrent keep-alive clients on one box.
+
+    python -m benchmarks.servers [--concurrency 256] [--requests 20000] [--workers 1]
+                                 [--slow-clients 0]
+
+Each server is started on a free port, warmed up, then hit with
+``--concurrency`` connections issuing ``/times/date/`` requests back to
+back. ``--slow-clients`` additionally opens connections that send half a
+request and then stall for the whole run, the way slow mobile clients do.
+A dependency-free asyncio HTTP/1.1 client keeps the load generator itself
+cheap.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DATE_PATHS = [
+    f'/api/v1/times/date/?date={date(2026, 1, 1) + timedelta(days=i)}' for i in range(365)
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _profiles(port: int, workers: int):
+    bind = f'127.0.0.1:{port}'
+    return {
+        'wsgi (gunicorn sync, DRF views)': (
+            [sys.executable, '-m', 'gunicorn', 'prayer_api.wsgi:application',
+             '--bind', bind, '--workers', str(workers), '--log-level', 'warning'],
+            {},
+        ),
+        'wsgi (gunicorn gthread x8, DRF views)': (
+            [sys.executable, '-m', 'gunicorn', 'prayer_api.wsgi:application',
+             '--bind', bind, '--workers', str(workers), '--threads', '8', '--log-level', 'warning'],
+            {},
+        ),
+        'asgi (uvicorn, async views)': (
+            [sys.executable, '-m', 'uvicorn', 'prayer_api.asgi:application',
+             '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+             '--log-level', 'warning', '--no-access-log'],
+            {'DJANGO_SETTINGS_MODULE': 'prayer_api.settings_asgi'},
+        ),
+    }
+
+
+async def http_request(reader, writer, path: str, method: str = 'GET', body: bytes = b'') -> int:
+    """
+    One HTTP/1.1 request on a keep-alive connection; returns the status code.
+    Closes ``writer`` when the server answers ``Connection: close``.
+    """
+    head = f'{method} {path} HTTP/1.1\r\nHost: bench\r\n'
+    if body:
+        head += f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+    writer.write(head.encode() + b'\r\n' + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError  # closed by the server after the previous response
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.partition(b':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'transfer-encoding':
+            chunked = value == b'chunked'
+        elif name == b'connection':
+            close = value == b'close'
+    if not chunked:
+        await reader.readexactly(length)
+    else:
+        while length := int((await reader.readline()).split(b';')[0], 16):
+            await reader.readexactly(length + 2)
+        await reader.readline()
+    if close:
+        writer.close()
+    return int(status_line.split()[1])
+
+
+async def _client(port: int, count: int, paths: list, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        for _ in range(count):
+            path = random.choice(paths)
+            started = time.perf_counter()
+            if writer.is_closing():
+                # sync gunicorn workers close the connection after each response
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            status = await http_request(reader, writer, path)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _stall(port: int, done: asyncio.Event):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'GET /api/v1/times/today/ HTTP/1.1\r\n')
+    await writer.drain()
+    await done.wait()
+    writer.close()
+
+
+async def load(port: int, concurrency: int, total: int, slow_clients: int = 0, paths=None):
+    """
+    Issue ``total`` GETs for random ``paths`` (default: /times/date/ for
+    random days) over ``concurrency`` connections. Returns the latencies in
+    seconds, the non-200 statuses and the elapsed wall time.
+    """
+    paths = paths or DATE_PATHS
+    latencies, errors = [], []
+    per_client = max(1, total // concurrency)
+    done = asyncio.Event()
+    stalled = [asyncio.create_task(_stall(port, done)) for _ in range(slow_clients)]
+    await asyncio.sleep(0.2)
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(port, per_client, paths, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*stalled)
+    return latencies, errors, elapsed
+
+
+def wait_until_up(port: int, proc: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'server exited with {proc.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('server did not start')
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--slow-clients', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{args.requests} requests, {args.concurrency} connections, '
+          f'{args.slow_clients} slow clients, {args.workers} worker(s)')
+    print(f"{'profile':<40}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for name in _profiles(0, args.workers):
+        port = free_port()
+        command, env = _profiles(port, args.workers)[name]
+        proc = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env})
+        try:
+            wait_until_up(port, proc)
+            asyncio.run(load(port, 8, 400))  # warm up
+            latencies, errors, elapsed = asyncio.run(
+                load(port, args.concurrency, args.requests, args.slow_clients))
+        finally:
+            proc.terminate()
+            proc.wait()
+        latencies.sort()
+        print(f'{name:<40}{len(latencies) / elapsed:>9.0f}'
+              f'{percentile(latencies, 0.50) * 1000:>9.1f}'
+              f'{percentile(latencies, 0.99) * 1000:>9.1f}{len(errors):>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark suite behind ``python manage.py benchmark``.
+
+Three groups, each reported as ops/sec and p50/p95/p99 latency:
+
+    micro   the lookup core in times.utils and the serializers, in-process
+    client  every endpoint through the Django test client
+    server  every GET endpoint against a locally started gunicorn
+
+Results are plain dicts so runs can be saved as JSON and compared.
+"""
+import asyncio
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import django
+from django.conf import settings
+
+from . import servers
+
+DAY = date(2026, 9, 23)
+MOMENT = datetime(2026, 9, 23, 15, 45)
+YEAR = (date(2026, 1, 1), date(2026, 12, 31))
+
+ENDPOINTS = [
+    ('today', '/api/v1/times/today/?madhab=shafi&city=colombo'),
+    ('date', '/api/v1/times/date/?madhab=hanafi&city=others&date=2026-09-23'),
+    ('next', '/api/v1/times/next/?madhab=shafi&city=colombo&datetime=2026-09-23T15:45'),
+    ('range 31d', '/api/v1/times/range/?start=2026-03-01&end=2026-03-31'),
+    ('range 366d ndjson', '/api/v1/times/range/?start=2026-01-01&end=2026-12-31&format=ndjson'),
+    ('year', '/api/v1/times/year/?year=2026'),
+    ('matrix', '/api/v1/times/matrix/?date=2026-09-23'),
+    ('schema', '/api/v1/schema/'),
+]
+BATCH = [{'type': 'date', 'date': f'2026-03-{day:02d}'} for day in range(1, 21)]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """ops/sec over ``elapsed`` seconds and latency percentiles in microseconds."""
+    latencies = sorted(latencies)
+    return {
+        'n': len(latencies),
+        'ops_per_sec': len(latencies) / elapsed,
+        'p50_us': servers.percentile(latencies, 0.50) * 1e6,
+        'p95_us': servers.percentile(latencies, 0.95) * 1e6,
+        'p99_us': servers.percentile(latencies, 0.99) * 1e6,
+    }
+
+
+def measure(fn: Callable[[], object], n: int) -> Dict[str, float]:
+    """Call ``fn`` ``n`` times after a short warm-up, timing every call."""
+    for _ in range(max(1, n // 10)):
+        fn()
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(n):
+        t = clock()
+        fn()
+        latencies.append(clock() - t)
+    return summarize(latencies, clock() - started)
+
+
+def _micro_cases() -> List[Tuple[str, Callable[[], object], int]]:
+    from rest_framework.renderers import JSONRenderer
+
+    from times.responses import render_json
+    from times.serializers import PrayerTimesRangeSerializer, PrayerTimesSerializer
+    from times.utils import (
+        get_times_for_day, get_times_for_range, next_prayer, upcoming_prayers,
+    )
+
+    day = get_times_for_day(DAY, 'shafi', 'colombo')
+    year = {
+        'start': YEAR[0], 'end': YEAR[1], 'madhab': 'shafi', 'city': 'colombo',
+        'results': get_times_for_range(*YEAR, 'shafi', 'colombo'),
+    }
+    renderer = JSONRenderer()
+    return [
+        ('get_times_for_day', lambda: get_times_for_day(DAY, 'shafi', 'colombo'), 20000),
+        ('next_prayer', lambda: next_prayer(MOMENT, 'shafi', 'colombo'), 20000),
+        ('upcoming_prayers x5', lambda: upcoming_prayers(MOMENT, 'shafi', 'colombo', 5), 20000),
+        ('get_times_for_range 365d', lambda: get_times_for_range(*YEAR, 'shafi', 'colombo'), 200),
+        ('render_json day', lambda: render_json(day.as_payload()), 20000),
+        ('PrayerTimesSerializer', lambda: renderer.render(PrayerTimesSerializer(day).data), 2000),
+        ('PrayerTimesRangeSerializer 365d',
+         lambda: renderer.render(PrayerTimesRangeSerializer(year).data), 20),
+    ]
+
+
+def _client_cases() -> List[Tuple[str, Callable[[], object], int]]:
+    from django.test import Client
+
+    client = Client()
+
+    def get(path):
+        def call():
+            response = client.get(path)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            assert response.status_code == 200, (path, response.status_code)
+        return call
+
+    def batch():
+        response = client.post('/api/v1/times/batch/', BATCH, content_type='application/json')
+        assert response.status_code == 200, response.status_code
+
+    cases = [(name, get(path), 50 if 'ndjson' in name else 1000) for name, path in ENDPOINTS]
+    cases.append(('batch x20', batch, 500))
+    return cases
+
+
+def _server_results(quick: bool, only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    endpoints = [(name, path) for name, path in ENDPOINTS if not only or only in f'server: {name}']
+    if not endpoints:
+        return {}
+    port = servers.free_port()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'prayer_api.wsgi:application',
+         '--bind', f'127.0.0.1:{port}', '--workers', '1', '--log-level', 'warning'],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE},
+    )
+    results = {}
+    try:
+        servers.wait_until_up(port, proc)
+        for name, path in endpoints:
+            total = 40 if 'ndjson' in name else 400
+            total = total // 4 if quick else total
+            asyncio.run(servers.load(port, 4, max(4, total // 10), paths=[path]))
+            latencies, errors, elapsed = asyncio.run(servers.load(port, 8, total, paths=[path]))
+            if errors:
+                raise RuntimeError(f'{path}: {len(errors)} non-200 responses')
+            results[f'server: {name}'] = summarize(latencies, elapsed)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return results
+
+
+def run(quick: bool = False, server: bool = True, only: Optional[str] = None,
+        progress: Callable[[str, Dict[str, float]], None] = lambda name, result: None) -> Dict:
+    """
+    Run the suite. ``only`` keeps the benchmarks whose name contains it;
+    ``quick`` cuts iteration counts tenfold for smoke runs.
+    """
+    results = {}
+    for group, cases in (('micro', _micro_cases), ('client', _client_cases)):
+        for name, fn, n in cases():
+            name = f'{group}: {name}'
+            if only and only not in name:
+                continue
+            results[name] = measure(fn, max(5, n // 10) if quick else n)
+            progress(name, results[name])
+    if server:
+        for name, result in _server_results(quick, only).items():
+            results[name] = result
+            progress(name, result)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'machine': platform.machine(),
+            'settings': settings.SETTINGS_MODULE,
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[Tuple[str, float, float, float]]:
+    """
+    Benchmarks whose ops/sec fell by more than ``threshold`` (0.2 = 20%)
+    against ``baseline``, as (name, baseline ops/sec, ops/sec, change).
+    """
+    regressions = []
+    for name, result in results['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+        if change < -threshold:
+            regressions.append((name, before['ops_per_sec'], result['ops_per_sec'], change))
+    return regressions
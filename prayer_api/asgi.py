@@ -2,6 +2,7 @@
 ASGI config for prayer_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Defaults to the ASGI profile, prayer_api/settings_asgi.py.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -11,6 +12,6 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prayer_api.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prayer_api.settings_asgi')
 
 application = get_asgi_application()
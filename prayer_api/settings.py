@@ -42,6 +42,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'times.middleware.MetricsMiddleware',
+    'times.middleware.ServerTimingMiddleware',
+    'times.middleware.SamplingProfilerMiddleware',
+    'times.middleware.DatasetSnapshotMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -105,6 +109,79 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Times API
+
+# Dataset years (prayer_api/data_lk/<year>/) kept compiled in memory at once.
+TIMES_MAX_RESIDENT_YEARS = 3
+
+# Serve the current and next year from the latest earlier year's tables when
+# they have no directory yet (the ACJU tables are perennial).
+TIMES_PERENNIAL_FALLBACK = True
+
+# Rendered /date/ and /today/ bodies kept in memory. Four datasets of 366 days
+# fit comfortably; set TIMES_RESPONSE_CACHE_WARM to render them all at startup.
+TIMES_RESPONSE_CACHE_SIZE = 4096
+TIMES_RESPONSE_CACHE_WARM = False
+
+# Seconds between checks of prayer_api/data_lk/ for changed files; a change is
+# loaded in the background and swapped in without a restart. Off (0) by default:
+# the Docker image bakes the data in, and while it is on responses are never
+# cached as immutable. Turn it on (e.g. 30) where data_lk/ is a mounted volume.
+TIMES_DATASET_RELOAD_INTERVAL = 0
+
+# Render and compress the /times/year/ and /times/month/ bodies of the resident
+# years at startup (about 70 ms) rather than on the first request for each.
+TIMES_BULK_PRERENDER = True
+
+# Cache-Control max-age for responses that only change with the dataset.
+TIMES_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# While TIMES_DATASET_RELOAD_INTERVAL is on, the longest any response may be
+# cached before clients revalidate it (a 304 while the dataset is unchanged).
+TIMES_RELOADABLE_MAX_AGE = 60 * 60
+
+# Longest /times/range/ answered as one JSON body.
+TIMES_RANGE_MAX_DAYS = 10 * 366
+
+# /times/range/?format=ndjson: longest range accepted, and days rendered per chunk.
+TIMES_RANGE_STREAM_MAX_DAYS = 10 * 366
+TIMES_RANGE_STREAM_CHUNK_DAYS = 31
+
+# How long /times/calendar.ics may be cached before calendar apps revalidate.
+TIMES_CALENDAR_MAX_AGE = 6 * 60 * 60
+
+# Longest range accepted by /times/matrix/; each day carries every madhab and city.
+TIMES_MATRIX_MAX_DAYS = 366
+
+# Most queries accepted in one POST /times/batch/ request.
+TIMES_BATCH_MAX_QUERIES = 100
+
+# Largest "count" and "hours" accepted by /times/upcoming/.
+TIMES_UPCOMING_MAX_COUNT = 100
+TIMES_UPCOMING_MAX_HOURS = 7 * 24
+
+# Seconds between heartbeat comments on idle /times/events/ streams.
+TIMES_EVENTS_HEARTBEAT = 30
+
+# Where "manage.py build_openapi_schema" writes the pre-generated schema.
+TIMES_SCHEMA_DIR = BASE_DIR / 'build' / 'openapi'
+
+# Route the native async views instead of the DRF ones. Enabled by the ASGI
+# profile, prayer_api/settings_asgi.py.
+TIMES_ASYNC_VIEWS = False
+
+# Per-stage timings (validate, load, lookup, render, total): as a Server-Timing
+# response header, and/or as INFO records on the "times.timing" logger.
+TIMES_SERVER_TIMING = False
+TIMES_TIMING_LOG = False
+
+# Profile this fraction of requests with cProfile, plus any request sending
+# "X-Times-Profile: <TIMES_PROFILE_SECRET>". The newest TIMES_PROFILE_KEEP
+# profiles are kept in TIMES_PROFILE_DIR; see "manage.py profiles".
+TIMES_PROFILE_RATE = 0.0
+TIMES_PROFILE_SECRET = ''
+TIMES_PROFILE_DIR = BASE_DIR / 'build' / 'profiles'
+TIMES_PROFILE_KEEP = 100
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
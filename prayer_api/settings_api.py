@@ -0,0 +1,50 @@
+"""
+API-only profile: serves the times API and its docs with no database,
+no sessions, auth or messages, and six middleware: the times ones plus
+security and common. Server timing and the sampling profiler take themselves
+out unless their settings turn them on.
+
+    DJANGO_SETTINGS_MODULE=prayer_api.settings_api gunicorn prayer_api.wsgi:application
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'django.contrib.staticfiles',  # Swagger UI / Redoc assets
+    'rest_framework',
+    'times',
+    'drf_spectacular',
+    'drf_spectacular_sidecar',
+]
+
+MIDDLEWARE = [
+    'times.middleware.MetricsMiddleware',
+    'times.middleware.ServerTimingMiddleware',
+    'times.middleware.SamplingProfilerMiddleware',
+    'times.middleware.DatasetSnapshotMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+DATABASES = {}
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # No auth backends: DRF never builds a user, so contrib.auth is not needed.
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+}
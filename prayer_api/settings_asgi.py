@@ -0,0 +1,20 @@
+"""
+ASGI profile: the API-only profile with the native async times views and
+its middleware in a form that never leaves the event loop.
+
+Used by prayer_api/asgi.py, e.g.
+
+    uvicorn prayer_api.asgi:application --workers 4
+"""
+from .settings_api import *  # noqa: F401,F403
+
+TIMES_ASYNC_VIEWS = True
+
+MIDDLEWARE = [
+    'times.middleware.MetricsMiddleware',
+    'times.middleware.ServerTimingMiddleware',
+    'times.middleware.SamplingProfilerMiddleware',
+    'times.middleware.DatasetSnapshotMiddleware',
+    'times.middleware.AsyncSecurityMiddleware',
+    'times.middleware.AsyncCommonMiddleware',
+]
@@ -16,13 +16,21 @@ Including another URLconf
 """
 from django.urls import path, include
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
+
+from times.metrics import metrics_view
+from times.schema import CachedSpectacularAPIView
+from times.urls import sync_urlpatterns
+
+# Documented from the DRF views even when the async views are routed.
+schema_patterns = [path('api/v1/', include(sync_urlpatterns))]
+
 urlpatterns = [
-    path('api/v1/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/v1/schema/', CachedSpectacularAPIView.as_view(patterns=schema_patterns), name='schema'),
     path('api/v1/docs/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/v1/docs/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     path('api/v1/', include('times.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
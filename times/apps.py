@@ -1,6 +1,40 @@
 from django.apps import AppConfig
 
 
+def _dataset_reloaded(sender, **kwargs):
+    """Drop bodies rendered from the previous datasets and render the new ones."""
+    from django.conf import settings
+
+    from .bulk import bulk_payloads, prerender_bulk_payloads
+    from .cache import response_cache, warm_response_cache
+
+    response_cache.clear()
+    bulk_payloads.clear()
+    if getattr(settings, 'TIMES_RESPONSE_CACHE_WARM', False):
+        warm_response_cache()
+    if getattr(settings, 'TIMES_BULK_PRERENDER', True):
+        prerender_bulk_payloads()
+
+
 class TimesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'times'
+
+    def ready(self):
+        from django.conf import settings
+
+        from .store import DatasetWatcher, dataset_reloaded, timetable_store
+        timetable_store.load()
+        dataset_reloaded.connect(_dataset_reloaded, sender=timetable_store, dispatch_uid='times.dataset_reloaded')
+
+        if getattr(settings, 'TIMES_RESPONSE_CACHE_WARM', False):
+            from .cache import warm_response_cache
+            warm_response_cache()
+
+        if getattr(settings, 'TIMES_BULK_PRERENDER', True):
+            from .bulk import prerender_bulk_payloads
+            prerender_bulk_payloads()
+
+        interval = getattr(settings, 'TIMES_DATASET_RELOAD_INTERVAL', 0)
+        if interval > 0:
+            DatasetWatcher(timetable_store, interval).start()
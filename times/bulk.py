@@ -0,0 +1,150 @@
+"""
+Whole-year and whole-month bodies for /times/year/ and /times/month/.
+
+A dataset year is rendered for a (madhab, city) pair in one pass: the
+year body and its twelve month bodies, each stored as is, gzipped and,
+when the optional ``brotli`` package is installed, brotli-compressed.
+Serving one is then a lookup and a copy of bytes.
+"""
+import calendar
+import gzip
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+from .responses import render_body
+from .store import timetable_store
+from .utils import get_times_for_range
+from .validation import VALID_CITIES, VALID_MADHABS
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+# On a year body quality 11 is ~15% smaller than 5 but over a hundred times slower.
+BROTLI_QUALITY = 5
+
+
+class Encoded(NamedTuple):
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+    def best(self, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+        """(Content-Encoding or None, body) for an ``Accept-Encoding`` value."""
+        accepted = accepted_encodings(accept_encoding)
+        if self.br is not None and 'br' in accepted:
+            return 'br', self.br
+        if 'gzip' in accepted:
+            return 'gzip', self.gzip
+        return None, self.identity
+
+
+def accepted_encodings(header: str) -> set:
+    """Codings in an ``Accept-Encoding`` header with a non-zero q-value."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding == '*':
+            accepted.update(('br', 'gzip'))
+        elif coding:
+            accepted.add(coding)
+    return accepted
+
+
+def encode(body: bytes) -> Encoded:
+    return Encoded(
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=BROTLI_QUALITY) if brotli is not None else None,
+    )
+
+
+def _payload(start: date, end: date, madhab: str, city: str, rows) -> bytes:
+    # The /range/ body for the same dates.
+    return render_body({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'madhab': madhab,
+        'city': city,
+        'results': rows,
+    })
+
+
+class BulkPayloads:
+    """
+    Encoded year and month bodies, per dataset version and (madhab, city,
+    year), for at most ``max_years`` dataset years per pair.
+    """
+
+    def __init__(self, max_years: int):
+        self.max_entries = max_years * len(VALID_MADHABS) * len(VALID_CITIES)
+        self._entries: 'OrderedDict[Tuple[str, str, str, int], Dict[Optional[int], Encoded]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _render(self, madhab: str, city: str, year: int) -> Dict[Optional[int], Encoded]:
+        start, end = date(year, 1, 1), date(year, 12, 31)
+        rows = get_times_for_range(start, end, madhab, city)
+        bodies = {None: encode(_payload(start, end, madhab, city, rows))}
+        first = 0
+        for month in range(1, 13):
+            days = calendar.monthrange(year, month)[1]
+            bodies[month] = encode(_payload(
+                date(year, month, 1), date(year, month, days), madhab, city, rows[first:first + days],
+            ))
+            first += days
+        return bodies
+
+    def get(self, madhab: str, city: str, year: int, month: Optional[int] = None) -> Encoded:
+        """The year body, or a month's. The caller checks the year has data."""
+        key = (timetable_store.version, madhab, city, year)
+        with self._lock:
+            bodies = self._entries.get(key)
+            if bodies is not None:
+                self._entries.move_to_end(key)
+                return bodies[month]
+
+        # Render outside the lock, as ResponseCache does.
+        bodies = self._render(madhab, city, year)
+        with self._lock:
+            self._entries[key] = bodies
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bodies[month]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(
+                len(e.identity) + len(e.gzip) + len(e.br or b'')
+                for bodies in self._entries.values() for e in bodies.values()
+            )
+
+
+bulk_payloads = BulkPayloads(getattr(settings, 'TIMES_MAX_RESIDENT_YEARS', 3))
+
+
+def prerender_bulk_payloads() -> int:
+    """Render every pair of the resident years up front. Returns the body count."""
+    count = 0
+    for year in timetable_store.stats()['resident_years']:
+        for madhab in sorted(VALID_MADHABS):
+            for city in sorted(VALID_CITIES):
+                bulk_payloads.get(madhab, city, year)
+                count += 13
+    return count
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Callable, Dict, Hashable
+
+from django.conf import settings
+
+from .responses import render_body
+from .store import timetable_store
+from .utils import get_times_for_day
+from .validation import VALID_CITIES, VALID_MADHABS
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU of rendered response bodies.
+
+    The timetables are static, so a body rendered once for a key stays valid
+    for as long as the loaded datasets do; keys carry the dataset version.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        # Render outside the lock; a concurrent miss on the same key just
+        # renders the same bytes twice.
+        body = render()
+        self.put(key, body)
+        return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+        }
+
+
+response_cache = ResponseCache(getattr(settings, 'TIMES_RESPONSE_CACHE_SIZE', 4096))
+
+
+def day_body(d: date, madhab: str, city: str) -> bytes:
+    """Rendered /date/ body; /today/ shares the entry for the Colombo date."""
+    return response_cache.get_or_render(
+        (timetable_store.version, 'date', madhab, city, d),
+        lambda: render_body(get_times_for_day(d, madhab, city).as_payload()),
+    )
+
+
+def warm_response_cache() -> int:
+    """
+    Render every day of every dataset in the resident years up front.
+    Returns the entry count.
+    """
+    for year in timetable_store.stats()['resident_years']:
+        for madhab in sorted(VALID_MADHABS):
+            for city in sorted(VALID_CITIES):
+                d = date(year, 1, 1)
+                while d.year == year:
+                    day_body(d, madhab, city)
+                    d += timedelta(days=1)
+    return len(response_cache)
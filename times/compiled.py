@@ -0,0 +1,97 @@
+"""
+Binary form of the compiled timetables, read through ``mmap``.
+
+Layout (little-endian)::
+
+    header   magic 'PTTB', format version, columns, days per table,
+             entry count, SHA-256 of the JSON sources (store.version)
+    index    one entry per year/madhab/city: names and byte offset
+    data     DAYS_PER_TABLE x N_COLUMNS uint16 minutes per entry
+
+The JSON files stay the source of truth; a file whose checksum does not
+match them is ignored.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .timetable import DAYS_PER_TABLE, N_COLUMNS, Timetable
+
+COMPILED_NAME = 'timetables.bin'
+MAGIC = b'PTTB'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHHH32s')
+_ENTRY = struct.Struct('<H16s16sI')
+_TABLE_BYTES = DAYS_PER_TABLE * N_COLUMNS * 2
+_ALIGN = 16
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_compiled(path: Path, checksum: str, tables: Iterable[Timetable]) -> int:
+    """Write ``tables`` to ``path`` atomically. Returns the file size."""
+    tables = list(tables)
+    data_start = _align(_HEADER.size + _ENTRY.size * len(tables))
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, N_COLUMNS, DAYS_PER_TABLE, len(tables),
+                          bytes.fromhex(checksum))
+    index = b''.join(
+        _ENTRY.pack(t.year, t.madhab.encode(), t.city.encode(), data_start + i * _TABLE_BYTES)
+        for i, t in enumerate(tables)
+    )
+
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(header + index)
+        f.write(b'\0' * (data_start - len(header) - len(index)))
+        for t in tables:
+            data = array('H', t.data)
+            if sys.byteorder != 'little':
+                data.byteswap()
+            f.write(data.tobytes())
+    os.replace(tmp, path)
+    return data_start + len(tables) * _TABLE_BYTES
+
+
+class CompiledTimetables:
+    """A compiled timetable file mapped read-only into memory."""
+
+    def __init__(self, path: Path):
+        if sys.byteorder != 'little':
+            raise ValueError('Compiled timetables are little-endian')
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self._view = memoryview(self._mmap)
+
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f'{path} is truncated')
+        magic, version, columns, days, count, checksum = _HEADER.unpack_from(self._view)
+        if (magic, version, columns, days) != (MAGIC, FORMAT_VERSION, N_COLUMNS, DAYS_PER_TABLE):
+            raise ValueError(f'{path} is not a version {FORMAT_VERSION} timetable file')
+        self.checksum = checksum.hex()
+
+        self._offsets: Dict[Tuple[int, str, str], int] = {}
+        for i in range(count):
+            year, madhab, city, offset = _ENTRY.unpack_from(self._view, _HEADER.size + i * _ENTRY.size)
+            if offset + _TABLE_BYTES > len(self._view):
+                raise ValueError(f'{path} is truncated')
+            self._offsets[(year, madhab.rstrip(b'\0').decode(), city.rstrip(b'\0').decode())] = offset
+
+    @property
+    def years(self) -> List[int]:
+        return sorted({year for year, _, _ in self._offsets})
+
+    def has(self, madhab: str, city: str, year: int) -> bool:
+        return (year, madhab, city) in self._offsets
+
+    def data(self, madhab: str, city: str, year: int) -> memoryview:
+        """Zero-copy uint16 view of one table, shaped like ``compile_table`` output."""
+        offset = self._offsets[(year, madhab, city)]
+        return self._view[offset:offset + _TABLE_BYTES].cast('H')
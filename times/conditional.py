@@ -0,0 +1,60 @@
+import hashlib
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .store import timetable_store
+
+# Responses that only change with the dataset: /date/ and /range/.
+IMMUTABLE_MAX_AGE = getattr(settings, 'TIMES_IMMUTABLE_MAX_AGE', 365 * 24 * 60 * 60)
+# With hot reload on (see TimetableStore.reload) the dataset can change under
+# the same URLs, so nothing is immutable and nothing is fresh for longer than this.
+RELOADABLE = getattr(settings, 'TIMES_DATASET_RELOAD_INTERVAL', 0) > 0
+RELOADABLE_MAX_AGE = getattr(settings, 'TIMES_RELOADABLE_MAX_AGE', 60 * 60)
+
+
+def dataset_etag(*query) -> str:
+    """Strong ETag for ``query`` answered from the currently loaded datasets."""
+    key = '|'.join(str(part) for part in query).encode()
+    return f'"{timetable_store.version[:16]}-{hashlib.sha256(key).hexdigest()[:16]}"'
+
+
+def _cache_headers(response: HttpResponse, etag: str, last_modified: float,
+                   expires: Optional[float]) -> HttpResponse:
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if RELOADABLE:
+        ceiling = time.time() + RELOADABLE_MAX_AGE
+        expires = ceiling if expires is None else min(expires, ceiling)
+    if expires is None:
+        response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = f'public, max-age={max(0, int(expires - time.time()))}'
+        response['Expires'] = http_date(expires)
+    return response
+
+
+def conditional(request, render: Callable[[], HttpResponse], *, etag: str,
+                expires: Optional[float] = None,
+                last_modified: Optional[float] = None) -> HttpResponse:
+    """
+    Answer ``304 Not Modified`` when the client's validators still match,
+    otherwise ``render()`` the response. Either way the response carries the
+    ETag plus Cache-Control: immutable when ``expires`` is None, else fresh
+    until that epoch; with hot reload on, fresh for at most
+    ``RELOADABLE_MAX_AGE``.
+
+    Validators are checked before ``render()`` runs, so callers must first
+    make sure the data exists: ``If-None-Match: *`` would otherwise turn a
+    404 into a 304.
+    """
+    if last_modified is None:
+        last_modified = timetable_store.last_modified
+    response = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if response is None:
+        response = render()
+    return _cache_headers(response, etag, last_modified, expires)
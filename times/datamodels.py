@@ -38,6 +38,15 @@ class PrayerTimes:
     def as_dict(self) -> Dict[str, str]:
         return self.times
 
+    def as_payload(self) -> Dict:
+        """Same shape as ``PrayerTimesSerializer`` output."""
+        return {
+            'date': self.date.isoformat(),
+            'madhab': self.madhab,
+            'city': self.city,
+            'times': self.times,
+        }
+
 
 @dataclass
 class PrayerEvent:
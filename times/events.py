@@ -0,0 +1,145 @@
+"""
+Server-sent events behind /times/events/ (ASGI only).
+
+Every subscriber of a (madhab, city) pair shares one channel. The channel
+has a single timer task that looks up the next event on the precomputed
+timeline, sleeps until it arrives, and then pushes the same encoded frame
+to every subscriber queue. An idle subscriber costs a queue and a
+suspended generator, not a task or a thread.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+from django.conf import settings
+
+from .responses import render_json
+from .store import timetable_store
+from .utils import LANKA_TZ, PrayerDataNotAvailable, upcoming_prayers
+
+HEARTBEAT_SECONDS = getattr(settings, 'TIMES_EVENTS_HEARTBEAT', 30)
+RETRY_MS = 5000
+# Events replayed to a client reconnecting with Last-Event-ID.
+MAX_CATCH_UP = 8
+# Longest single sleep, so a timer notices wall clock and dataset changes.
+MAX_SLEEP_SECONDS = 60
+# Frames buffered per subscriber; a client this far behind misses events.
+QUEUE_SIZE = 16
+
+
+def event_frame(event, kind: str) -> bytes:
+    """One SSE message. Reached prayers carry their epoch as the event id."""
+    data = render_json({
+        'name': event.name,
+        'date': event.time.date().isoformat(),
+        'time': event.time.strftime('%H:%M'),
+        'madhab': event.madhab,
+        'city': event.city,
+    })
+    event_id = b'id: %d\n' % event.time.timestamp() if kind == 'prayer' else b''
+    return b'event: ' + kind.encode() + b'\n' + event_id + b'data: ' + data + b'\n\n'
+
+
+class Channel:
+    __slots__ = ('subscribers', 'timer')
+
+    def __init__(self):
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.timer: Optional[asyncio.Task] = None
+
+
+class EventHub:
+    """Per-process registry of channels; use from the server's event loop."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._channels: Dict[Tuple[str, str], Channel] = {}
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self.clock(), LANKA_TZ)
+
+    def _upcoming(self, since: datetime, madhab: str, city: str, count: int):
+        try:
+            return upcoming_prayers(since, madhab, city, count)
+        except PrayerDataNotAvailable:
+            return []
+
+    def subscribers(self, madhab: str, city: str) -> int:
+        channel = self._channels.get((madhab, city))
+        return len(channel.subscribers) if channel else 0
+
+    def subscribe(self, madhab: str, city: str) -> asyncio.Queue:
+        channel = self._channels.get((madhab, city))
+        if channel is None:
+            channel = self._channels[(madhab, city)] = Channel()
+        queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+        channel.subscribers.add(queue)
+        if channel.timer is None:
+            channel.timer = asyncio.create_task(self._run(madhab, city, channel))
+        return queue
+
+    def unsubscribe(self, madhab: str, city: str, queue: asyncio.Queue) -> None:
+        channel = self._channels.get((madhab, city))
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            channel.timer.cancel()
+            del self._channels[(madhab, city)]
+
+    def publish(self, channel: Channel, frame: bytes) -> None:
+        for queue in channel.subscribers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                pass
+
+    async def _run(self, madhab: str, city: str, channel: Channel) -> None:
+        # New subscribers are told the next event by stream(); after each
+        # prayer the channel announces the one after it.
+        announce = False
+        while True:
+            events = self._upcoming(self._now(), madhab, city, 1)
+            if not events:
+                return  # end of the data: subscribers only get heartbeats
+            if announce:
+                self.publish(channel, event_frame(events[0], 'next'))
+            version = timetable_store.version
+            due = events[0].time.timestamp()
+            while (delay := due - self.clock()) > 0:
+                await asyncio.sleep(min(delay, MAX_SLEEP_SECONDS))
+                if timetable_store.version != version:
+                    break  # reloaded: look the event up again and re-announce it
+            else:
+                self.publish(channel, event_frame(events[0], 'prayer'))
+            announce = True
+
+    async def stream(self, madhab: str, city: str, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        The SSE body for one client: a ``next`` event announcing the coming
+        prayer, then a ``prayer`` event each time one is reached followed by
+        a ``next`` event for the one after, with comment heartbeats between.
+        ``last_event_id`` first replays the prayers reached since that event.
+        """
+        queue = self.subscribe(madhab, city)
+        try:
+            yield b'retry: %d\n\n' % RETRY_MS
+            now = self._now()
+            if last_event_id and last_event_id.isdigit():
+                since = datetime.fromtimestamp(int(last_event_id), LANKA_TZ)
+                for event in self._upcoming(since, madhab, city, MAX_CATCH_UP):
+                    if event.time <= now:
+                        yield event_frame(event, 'prayer')
+            for event in self._upcoming(now, madhab, city, 1):
+                yield event_frame(event, 'next')
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b': keep-alive\n\n'
+        finally:
+            self.unsubscribe(madhab, city, queue)
+
+
+event_hub = EventHub()
@@ -0,0 +1,74 @@
+"""
+iCalendar (RFC 5545) export behind /times/calendar.ics.
+
+The calendar is produced a chunk of days at a time, so memory stays flat
+however long the range. Event times are written in UTC, which needs no
+VTIMEZONE block; calendar apps show them in the viewer's zone.
+"""
+import time
+from datetime import date
+from typing import Iterator
+
+from .timeline import local_midnight_epoch
+from .utils import PRAYERS, hhmm_to_minutes, iter_times_for_range
+
+PRODID = '-//prayer-api//Prayer Times Sri Lanka//EN'
+
+
+def _utc(epoch: float) -> str:
+    return time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(epoch))
+
+
+def _lines(*lines: str) -> bytes:
+    return ''.join(line + '\r\n' for line in lines).encode()
+
+
+def _events(row, stamp: str) -> bytes:
+    d = date.fromisoformat(row['date'])
+    times = row['times']
+    if 'error' in times:
+        return b''
+    midnight = local_midnight_epoch(d)
+    out = []
+    for name in PRAYERS:
+        start = midnight + hhmm_to_minutes(times[name]) * 60
+        out.append(_lines(
+            'BEGIN:VEVENT',
+            f"UID:{row['date']}-{name}-{row['madhab']}-{row['city']}@prayer-api",
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{_utc(start)}',
+            f'SUMMARY:{name.capitalize()}',
+            'TRANSP:TRANSPARENT',
+            'END:VEVENT',
+        ))
+    return b''.join(out)
+
+
+def iter_calendar(start: date, end: date, madhab: str, city: str, *, chunk_days: int,
+                  refresh_seconds: int, last_modified: float) -> Iterator[bytes]:
+    """
+    A VCALENDAR with one VEVENT per prayer (and sunrise) per day. UIDs are
+    stable and DTSTAMP is the dataset's modification time, so the bytes only
+    change with the data.
+    """
+    stamp = _utc(last_modified)
+    refresh = f'PT{max(1, refresh_seconds // 3600)}H'
+    header = _lines(
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:Prayer times ({madhab}\\, {city})',
+        'X-WR-TIMEZONE:Asia/Colombo',
+        f'REFRESH-INTERVAL;VALUE=DURATION:{refresh}',
+        f'X-PUBLISHED-TTL:{refresh}',
+    )
+    return _chunks(header, iter_times_for_range(start, end, madhab, city, chunk_days), stamp)
+
+
+def _chunks(header: bytes, chunks, stamp: str) -> Iterator[bytes]:
+    yield header
+    for rows in chunks:
+        yield b''.join(_events(row, stamp) for row in rows)
+    yield _lines('END:VCALENDAR')
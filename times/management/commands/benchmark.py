@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import suite
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the benchmark suite (lookup core, serializers, every endpoint through the '
+        'test client and a local gunicorn) and optionally compare against a saved run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=Path, help='Write the results as JSON to this file.')
+        parser.add_argument('--compare', type=Path, help='Saved results to compare against.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Fail when ops/sec drops by more than this fraction (default 0.2).')
+        parser.add_argument('--only', help='Only run benchmarks whose name contains this.')
+        parser.add_argument('--quick', action='store_true', help='Ten times fewer iterations.')
+        parser.add_argument('--no-server', action='store_true', help='Skip the gunicorn benchmarks.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            baseline = json.loads(options['compare'].read_text())
+
+        self.stdout.write(f"{'benchmark':<44}{'ops/sec':>12}{'p50 us':>11}{'p95 us':>11}{'p99 us':>11}")
+
+        def progress(name, r):
+            self.stdout.write(f"{name:<44}{r['ops_per_sec']:>12.1f}{r['p50_us']:>11.1f}"
+                              f"{r['p95_us']:>11.1f}{r['p99_us']:>11.1f}")
+
+        results = suite.run(quick=options['quick'], server=not options['no_server'],
+                            only=options['only'], progress=progress)
+
+        if options['output']:
+            options['output'].parent.mkdir(parents=True, exist_ok=True)
+            options['output'].write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            regressions = suite.compare(results, baseline, options['threshold'])
+            for name, before, after, change in regressions:
+                self.stderr.write(f'{name}: {before:.1f} -> {after:.1f} ops/sec ({change:+.0%})')
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} benchmark(s) slowed down by more than {options['threshold']:.0%}"
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f"No benchmark slowed down by more than {options['threshold']:.0%}"
+            ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from times import schema
+from times.schema import CachedSpectacularAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the OpenAPI schema served at /api/v1/schema/ for the current code '
+        'version, so the server loads it instead of generating it on first request.'
+    )
+
+    def handle(self, *args, **options):
+        for path in schema.SCHEMA_DIR.glob('openapi-*'):
+            path.unlink()
+        CachedSpectacularAPIView.clear_cache()
+
+        url = reverse('schema')
+        view = resolve(url).func
+        for suffix in ('yaml', 'json'):
+            response = view(RequestFactory().get(url, {'format': suffix}))
+            if response.status_code != 200:
+                raise RuntimeError(f'{url}?format={suffix} returned {response.status_code}')
+
+        for path in CachedSpectacularAPIView.save_cache():
+            self.stdout.write(self.style.SUCCESS(f'Wrote {path}'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from times.compiled import COMPILED_NAME, write_compiled
+from times.store import TimetableStore, _datasets
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile prayer_api/data_lk/<year>/*.json into the binary timetable file '
+        'that the store memory-maps at startup.'
+    )
+
+    def handle(self, *args, **options):
+        store = TimetableStore(use_compiled=False)
+        tables = [
+            store.table(madhab, city, year)
+            for year in store.years
+            for madhab, city in _datasets()
+        ]
+        path = store.data_dir / COMPILED_NAME
+        size = write_compiled(path, store.version, tables)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(tables)} timetables for {store.years} to {path} ({size} bytes)'
+        ))
@@ -0,0 +1,55 @@
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+
+from times.profiling import profile_ring
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls', 'filename')
+
+
+class Command(BaseCommand):
+    help = (
+        'List the request profiles kept by the sampling profiler, or merge them into one '
+        'report (optionally saved as a pstats file for snakeviz, flameprof or gprof2dot).'
+    )
+
+    def add_arguments(self, parser):
+        actions = parser.add_subparsers(dest='action', required=True)
+        list_parser = actions.add_parser('list', help='One line per kept profile, oldest first.')
+        aggregate = actions.add_parser('aggregate', help='Merge profiles into one pstats report.')
+        for sub in (list_parser, aggregate):
+            sub.add_argument('--path', help='Only profiles whose request path contains this.')
+            sub.add_argument('--last', type=int, help='Only the newest N matching profiles.')
+        aggregate.add_argument('--sort', choices=SORT_KEYS, default='cumulative',
+                               help='Sort order of the report (default cumulative).')
+        aggregate.add_argument('--limit', type=int, default=30, help='Functions shown (default 30).')
+        aggregate.add_argument('--output', help='Also write the merged stats to this .prof file.')
+
+    def handle(self, *args, **options):
+        ring = profile_ring()
+        entries = ring.entries()
+        if options['path']:
+            entries = [e for e in entries if options['path'] in e.get('path', '')]
+        if options['last']:
+            entries = entries[-options['last']:]
+        if not entries:
+            raise CommandError(f'No matching profiles in {ring.directory}')
+
+        if options['action'] == 'list':
+            self.stdout.write(f"{'id':<40}{'status':>7}{'ms':>10}  {'reason':<7} request")
+            for e in entries:
+                self.stdout.write(f"{e['id']:<40}{e.get('status', '?'):>7}{e.get('duration_ms', 0):>10.1f}  "
+                                  f"{e.get('reason', '?'):<7} {e.get('method', '')} {e.get('path', '')}")
+            return
+
+        durations = [e['duration_ms'] for e in entries if 'duration_ms' in e]
+        self.stdout.write(f'{len(entries)} profiles'
+                          + (f', {sum(durations) / len(durations):.1f} ms mean request time' if durations else ''))
+        report = io.StringIO()
+        stats = ring.stats(e['id'] for e in entries)
+        stats.stream = report
+        stats.sort_stats(options['sort']).print_stats(options['limit'])
+        self.stdout.write(report.getvalue())
+        if options['output']:
+            stats.dump_stats(options['output'])
+            self.stdout.write(f"Wrote {options['output']}")
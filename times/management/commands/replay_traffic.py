@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import replay, servers
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a recorded traffic file (JSON lines of ts/method/path/query) against a '
+        'server at the recorded pace, a multiple of it, or a fixed rate, and report '
+        'throughput, latency percentiles and error rates per endpoint.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('traffic', type=Path, help='Traffic file, e.g. benchmarks/traffic/maghrib_spike.jsonl')
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help='Server to replay against (default http://127.0.0.1:8000).')
+        parser.add_argument('--serve', action='store_true',
+                            help='Start a local gunicorn for the replay instead of using --url.')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers with --serve.')
+        pace = parser.add_mutually_exclusive_group()
+        pace.add_argument('--speed', type=float, default=1.0,
+                          help='Replay this many times faster than recorded (default 1).')
+        pace.add_argument('--rps', type=float, help='Ignore timestamps and send at this fixed rate.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Connections (default 32).')
+        parser.add_argument('--output', type=Path, help='Write the report as JSON to this file.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['traffic']) as f:
+                records = replay.read_traffic(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"{options['traffic']}: {e}")
+        if not records:
+            raise CommandError(f"{options['traffic']} has no requests")
+        if options['speed'] <= 0 or (options['rps'] is not None and options['rps'] <= 0):
+            raise CommandError('--speed and --rps must be positive')
+
+        url, proc = options['url'], None
+        if options['serve']:
+            port = servers.free_port()
+            url = f'http://127.0.0.1:{port}'
+            proc = subprocess.Popen(
+                [sys.executable, '-m', 'gunicorn', 'prayer_api.wsgi:application',
+                 '--bind', f'127.0.0.1:{port}', '--workers', str(options['workers']),
+                 '--log-level', 'warning'],
+                cwd=settings.BASE_DIR,
+                env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE},
+            )
+            servers.wait_until_up(port, proc)
+
+        self.stdout.write(f"Replaying {len(records)} requests against {url}")
+        try:
+            report = replay.replay(url, records, speed=options['speed'], rps=options['rps'],
+                                   concurrency=options['concurrency'])
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+
+        self.stdout.write(f"{'endpoint':<32}{'requests':>9}{'req/s':>9}{'errors':>8}"
+                          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for endpoint, r in report['endpoints'].items():
+            self.stdout.write(f"{endpoint:<32}{r['requests']:>9}{r['rps']:>9.1f}{r['error_rate']:>8.1%}"
+                              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+        if options['output']:
+            options['output'].write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Wrote {options['output']}")
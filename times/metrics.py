@@ -0,0 +1,205 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from django.http import HttpResponse
+
+from .validation import VALID_CITIES, VALID_MADHABS
+
+# Upper bounds in seconds of the request duration histogram buckets.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[str, str, str, str, str]  # endpoint, method, status, madhab, city
+
+# Times routes that do not take madhab and city; they, and every route
+# outside the times API, get "none" for both.
+UNSCOPED_ROUTES = ('times/batch/', 'times/matrix/')
+
+
+class _Shard:
+    """One thread's counters. Only the owning thread writes to it."""
+
+    __slots__ = ('lock', 'requests', 'durations', 'in_flight')
+
+    def __init__(self):
+        # Uncontended except while a scrape copies the shard.
+        self.lock = threading.Lock()
+        self.requests: Dict[Labels, int] = {}
+        # Per label set: one count per bucket plus +Inf, then the sum.
+        self.durations: Dict[Labels, List[float]] = {}
+        self.in_flight = 0
+
+    def merge_into(self, requests, durations):
+        for labels, count in self.requests.items():
+            requests[labels] = requests.get(labels, 0) + count
+        for labels, counts in self.durations.items():
+            total = durations.setdefault(labels, [0] * (len(BUCKETS) + 2))
+            for i, value in enumerate(counts):
+                total[i] += value
+
+
+class RequestMetrics:
+    """
+    Request counters and latency histograms, sharded per thread so the
+    request path never waits on another request; ``snapshot()`` merges the
+    shards. Shards of finished threads are folded into a retired shard.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, _Shard]] = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def started(self) -> _Shard:
+        shard = self._shard()
+        shard.in_flight += 1
+        return shard
+
+    def finished(self, shard: _Shard, labels: Labels, seconds: float) -> None:
+        with shard.lock:
+            shard.in_flight -= 1
+            shard.requests[labels] = shard.requests.get(labels, 0) + 1
+            counts = shard.durations.get(labels)
+            if counts is None:
+                counts = shard.durations[labels] = [0] * (len(BUCKETS) + 2)
+            counts[bisect_left(BUCKETS, seconds)] += 1
+            counts[-1] += seconds
+
+    def snapshot(self):
+        """(requests, durations, in_flight) summed over every thread."""
+        requests, durations, in_flight = {}, {}, 0
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                with shard.lock:
+                    if thread.is_alive():
+                        alive.append((thread, shard))
+                        shard.merge_into(requests, durations)
+                        in_flight += shard.in_flight
+                    else:
+                        shard.merge_into(self._retired.requests, self._retired.durations)
+            self._shards = alive
+            self._retired.merge_into(requests, durations)
+        return requests, durations, in_flight
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shards = []
+            self._retired = _Shard()
+        self._local = threading.local()
+
+
+request_metrics = RequestMetrics()
+
+
+def request_labels(request, response) -> Labels:
+    match = request.resolver_match
+    endpoint = f'/{match.route}' if match is not None else 'unmatched'
+    if match is None or '/times/' not in endpoint or endpoint.endswith(UNSCOPED_ROUTES):
+        return endpoint, request.method, str(response.status_code), 'none', 'none'
+    madhab = (request.GET.get('madhab') or 'shafi').lower()
+    city = (request.GET.get('city') or 'colombo').lower()
+    return (
+        endpoint,
+        request.method,
+        str(response.status_code),
+        madhab if madhab in VALID_MADHABS else 'invalid',
+        city if city in VALID_CITIES else 'invalid',
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format, version 0.0.4."""
+    from .cache import response_cache
+    from .store import timetable_store
+
+    requests, durations, in_flight = request_metrics.snapshot()
+    names = ('endpoint', 'method', 'status', 'madhab', 'city')
+    lines = [
+        '# HELP times_http_requests_total Requests handled, by endpoint, status and dataset.',
+        '# TYPE times_http_requests_total counter',
+    ]
+    for labels, count in sorted(requests.items()):
+        lines.append(f'times_http_requests_total{{{_format_labels(names, labels)}}} {count}')
+
+    lines += [
+        '# HELP times_http_request_duration_seconds Time spent in the middleware stack and view.',
+        '# TYPE times_http_request_duration_seconds histogram',
+    ]
+    for labels, counts in sorted(durations.items()):
+        label_str = _format_labels(names, labels)
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, '+Inf'), counts):
+            cumulative += count
+            lines.append(
+                f'times_http_request_duration_seconds_bucket{{{label_str},le="{bound}"}} {cumulative}'
+            )
+        lines.append(f'times_http_request_duration_seconds_sum{{{label_str}}} {counts[-1]}')
+        lines.append(f'times_http_request_duration_seconds_count{{{label_str}}} {cumulative}')
+
+    lines += [
+        '# HELP times_http_requests_in_flight Requests currently being handled.',
+        '# TYPE times_http_requests_in_flight gauge',
+        f'times_http_requests_in_flight {in_flight}',
+    ]
+
+    stats = timetable_store.stats()
+    lines += [
+        '# HELP times_dataset_index_seconds Time taken to index the dataset years on disk.',
+        '# TYPE times_dataset_index_seconds gauge',
+        f"times_dataset_index_seconds {stats['load_ms'] / 1000}",
+        '# HELP times_dataset_load_seconds Time taken to compile a dataset year.',
+        '# TYPE times_dataset_load_seconds gauge',
+    ]
+    for year, ms in sorted(stats['year_load_ms'].items()):
+        lines.append(f'times_dataset_load_seconds{{year="{year}"}} {ms / 1000}')
+    lines += [
+        '# HELP times_dataset_resident_bytes Approximate memory held by resident dataset years.',
+        '# TYPE times_dataset_resident_bytes gauge',
+        f"times_dataset_resident_bytes {stats['memory_bytes']}",
+        '# HELP times_dataset_resident_years Dataset years compiled in memory.',
+        '# TYPE times_dataset_resident_years gauge',
+        f"times_dataset_resident_years {len(stats['resident_years'])}",
+        '# HELP times_dataset_reloads_total Dataset versions swapped in since startup.',
+        '# TYPE times_dataset_reloads_total counter',
+        f"times_dataset_reloads_total {stats['reloads']}",
+    ]
+
+    cache = response_cache.stats()
+    lookups = cache['hits'] + cache['misses']
+    lines += [
+        '# HELP times_response_cache_hits_total Rendered-body cache hits.',
+        '# TYPE times_response_cache_hits_total counter',
+        f"times_response_cache_hits_total {cache['hits']}",
+        '# HELP times_response_cache_misses_total Rendered-body cache misses.',
+        '# TYPE times_response_cache_misses_total counter',
+        f"times_response_cache_misses_total {cache['misses']}",
+        '# HELP times_response_cache_hit_ratio Hits over lookups since startup.',
+        '# TYPE times_response_cache_hit_ratio gauge',
+        f"times_response_cache_hit_ratio {cache['hits'] / lookups if lookups else 0.0}",
+        '# HELP times_response_cache_entries Rendered bodies currently cached.',
+        '# TYPE times_response_cache_entries gauge',
+        f"times_response_cache_entries {cache['entries']}",
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
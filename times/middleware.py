@@ -0,0 +1,261 @@
+import cProfile
+import hmac
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.common import CommonMiddleware
+from django.middleware.security import SecurityMiddleware
+
+from . import timing
+from .profiling import profile_ring
+from .metrics import request_labels, request_metrics
+from .store import timetable_store
+
+
+class InlineHooksMixin:
+    """
+    For ``MiddlewareMixin`` classes whose hooks only look at the request and
+    set headers. Under ASGI Django runs such hooks through ``sync_to_async``,
+    one worker thread round trip each; these never block, so call them on
+    the event loop instead.
+    """
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, 'process_request'):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            response = self.process_response(request, response)
+        return response
+
+
+class AsyncSecurityMiddleware(InlineHooksMixin, SecurityMiddleware):
+    pass
+
+
+class AsyncCommonMiddleware(InlineHooksMixin, CommonMiddleware):
+    pass
+
+
+class MetricsMiddleware:
+    """
+    Records every request in ``request_metrics``. Put it first in
+    MIDDLEWARE so the timing covers the rest of the stack; for streaming
+    responses it stops when the view returns, not when the body is sent.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        shard = request_metrics.started()
+        started = time.perf_counter()
+        response = self.get_response(request)
+        request_metrics.finished(shard, request_labels(request, response), time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        shard = request_metrics.started()
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        request_metrics.finished(shard, request_labels(request, response), time.perf_counter() - started)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Times the validate/load/lookup/render stages of each request (see
+    times.timing). With ``TIMES_SERVER_TIMING`` they are sent as a
+    ``Server-Timing`` header, with ``TIMES_TIMING_LOG`` logged to the
+    ``times.timing`` logger; with neither the middleware is not installed.
+    A streamed body is produced after the view returns, so only the stages
+    before the first byte are reported for it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.header = getattr(settings, 'TIMES_SERVER_TIMING', False)
+        self.log = getattr(settings, 'TIMES_TIMING_LOG', False)
+        if not (self.header or self.log):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = timing.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing.stop()
+        return self.report(request, response, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        timings = timing.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing.stop()
+        return self.report(request, response, timings, time.perf_counter() - started)
+
+    def report(self, request, response, timings, seconds):
+        timings.add('total', seconds)
+        if self.header:
+            response['Server-Timing'] = timings.server_timing()
+        if self.log:
+            stages = timings.milliseconds()
+            timing.logger.info(
+                'method=%s path=%s status=%s %s', request.method, request.path, response.status_code,
+                ' '.join(f'{stage}_ms={ms}' for stage, ms in stages.items()),
+                extra={'method': request.method, 'path': request.path,
+                       'status': response.status_code, 'timings_ms': stages},
+            )
+        return response
+
+
+# Held while a request is being profiled, across every thread and task.
+_profiling = threading.Lock()
+
+
+class SamplingProfilerMiddleware:
+    """
+    Runs a sample of requests under cProfile and keeps the stats in the
+    profile ring (see times.profiling, ``manage.py profiles``).
+
+    ``TIMES_PROFILE_RATE`` is the fraction of requests sampled at random;
+    a request whose ``X-Times-Profile`` header equals ``TIMES_PROFILE_SECRET``
+    is always profiled and gets its profile id back in the same header.
+    With neither set the middleware is not installed; otherwise an
+    unsampled request costs a random draw and a header lookup.
+
+    One request per process is profiled at a time: since Python 3.12 a
+    second profiler cannot be enabled while one is running. A request
+    sampled meanwhile, or while another profiling tool is active, simply
+    runs unprofiled.
+    """
+
+    header = 'X-Times-Profile'
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.rate = getattr(settings, 'TIMES_PROFILE_RATE', 0.0)
+        self.secret = getattr(settings, 'TIMES_PROFILE_SECRET', '')
+        if not (self.rate > 0 or self.secret):
+            raise MiddlewareNotUsed
+        self.ring = profile_ring()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self, request):
+        """None, 'rate' or 'header': whether and why to profile ``request``."""
+        if _profiling.locked():
+            return None
+        if self.secret:
+            value = request.headers.get(self.header)
+            if value is not None and hmac.compare_digest(value.encode(), self.secret.encode()):
+                return 'header'
+        if self.rate > 0 and random.random() < self.rate:
+            return 'rate'
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        reason = self.sampled(request)
+        profiler = self.start() if reason else None
+        if profiler is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(profiler)
+        return self.save(request, response, reason, profiler, started)
+
+    async def __acall__(self, request):
+        reason = self.sampled(request)
+        profiler = self.start() if reason else None
+        if profiler is None:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(profiler)
+        return self.save(request, response, reason, profiler, started)
+
+    def start(self):
+        """An enabled profiler, or None when another one is running."""
+        if not _profiling.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiling tool is active (Python 3.12+)
+            _profiling.release()
+            return None
+        return profiler
+
+    def stop(self, profiler):
+        profiler.disable()
+        _profiling.release()
+
+    def save(self, request, response, reason, profiler, started):
+        profile_id = self.ring.save(profiler, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+            'reason': reason,
+        })
+        if reason == 'header':
+            response[self.header] = profile_id
+        return response
+
+
+class DatasetSnapshotMiddleware:
+    """
+    Pins the current dataset snapshot for the rest of the request, so a
+    reload that lands meanwhile (see ``TimetableStore.reload``) never mixes
+    two versions in one response, its ETag and its cache entries. Streamed
+    bodies pin the snapshot when the view builds them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with timetable_store.pinned():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with timetable_store.pinned():
+            return await self.get_response(request)
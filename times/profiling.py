@@ -0,0 +1,80 @@
+"""
+Request profiles written by ``times.middleware.SamplingProfilerMiddleware``
+and read by ``manage.py profiles``.
+
+Each sampled request leaves two files in the ring directory: ``<id>.prof``,
+a pstats dump (open it with ``python -m pstats``, snakeviz or flameprof), and
+``<id>.json`` with the request line, status and duration. Ids start with
+the UTC time, so they sort oldest first; once more than ``keep`` profiles
+are present the oldest are deleted.
+"""
+import itertools
+import json
+import os
+import pstats
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+
+_sequence = itertools.count()
+
+
+class ProfileRing:
+    """A directory holding at most ``keep`` request profiles."""
+
+    def __init__(self, directory: Path, keep: int = 100):
+        self.directory = Path(directory)
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def save(self, profiler, meta: Dict) -> str:
+        """Dump ``profiler`` with its request ``meta``; returns the profile id."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        profile_id = f'{now:%Y%m%dT%H%M%S.%f}-{os.getpid()}-{next(_sequence)}'
+        profiler.dump_stats(self.directory / f'{profile_id}.prof')
+        meta = {'id': profile_id, 'created': now.isoformat(timespec='milliseconds'), **meta}
+        (self.directory / f'{profile_id}.json').write_text(json.dumps(meta))
+        self._prune()
+        return profile_id
+
+    def _prune(self) -> None:
+        with self._lock:
+            ids = self.ids()
+            for profile_id in ids[:max(0, len(ids) - self.keep)]:
+                for suffix in ('.prof', '.json'):
+                    # Another worker process may be pruning the same files.
+                    (self.directory / f'{profile_id}{suffix}').unlink(missing_ok=True)
+
+    def ids(self) -> List[str]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(path.stem for path in self.directory.glob('*.json'))
+
+    def entries(self) -> List[Dict]:
+        """Metadata of every profile, oldest first."""
+        entries = []
+        for profile_id in self.ids():
+            try:
+                entries.append(json.loads((self.directory / f'{profile_id}.json').read_text()))
+            except (OSError, ValueError):
+                entries.append({'id': profile_id})
+        return entries
+
+    def stats(self, ids: Iterable[str]) -> pstats.Stats:
+        """The given profiles merged into one ``pstats.Stats``."""
+        paths = [str(self.directory / f'{profile_id}.prof') for profile_id in ids]
+        if not paths:
+            raise ValueError('No profiles to aggregate')
+        return pstats.Stats(*paths)
+
+
+def profile_ring() -> ProfileRing:
+    """The ring configured by ``TIMES_PROFILE_DIR`` and ``TIMES_PROFILE_KEEP``."""
+    return ProfileRing(
+        getattr(settings, 'TIMES_PROFILE_DIR', settings.BASE_DIR / 'build' / 'profiles'),
+        keep=getattr(settings, 'TIMES_PROFILE_KEEP', 100),
+    )
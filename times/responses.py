@@ -0,0 +1,70 @@
+import json
+from typing import Any, Optional
+
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.status import HTTP_200_OK
+
+from .timing import timed
+
+# Matches DRF's JSONRenderer with the default COMPACT_JSON, UNICODE_JSON and
+# STRICT_JSON settings, so responses are byte-for-byte what the serializers
+# used to produce.
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+
+
+def render_json(data: Any) -> bytes:
+    """Encode plain dicts/lists/strings the way ``JSONRenderer`` would."""
+    return _encoder.encode(data).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+# For whole response bodies, timed as the "render" stage (times.timing). The
+# NDJSON stream calls render_json once per row and is sent after the view
+# returns, so it keeps the unwrapped function.
+render_body = timed('render')(render_json)
+
+
+class TimesJSONResponse(HttpResponse):
+    """
+    JSON response for the times views that skips serializers and content
+    negotiation; the payloads are fixed-shape dicts built from the store.
+    Pass ``rendered`` to send a body that was already encoded and cached.
+    """
+
+    def __init__(self, data: Any = None, status: int = HTTP_200_OK, *,
+                 rendered: Optional[bytes] = None, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        content = rendered if rendered is not None else render_body(data)
+        super().__init__(content=content, status=status, **kwargs)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON, selected with ``?format=ndjson`` or
+    ``Accept: application/x-ndjson``. Streaming views write their own lines;
+    this renders anything else (e.g. errors) as a single line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return render_json(data) + b'\n'
+
+
+class ICalendarRenderer(BaseRenderer):
+    """
+    Lets ``Accept: text/calendar`` through content negotiation for
+    /times/calendar.ics. The view streams calendars and sends errors as
+    JSON itself, so this only renders if something else answers.
+    """
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return render_json(data)
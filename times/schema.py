@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from importlib.metadata import version as package_version
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_DIR = Path(getattr(settings, 'TIMES_SCHEMA_DIR', settings.BASE_DIR / 'build' / 'openapi'))
+
+# Sources the schema is generated from, relative to BASE_DIR.
+_SOURCE_DIRS = ('prayer_api', 'times')
+_PACKAGES = ('django', 'djangorestframework', 'drf-spectacular')
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """
+    Hash of the project's Python sources, the settings module and the
+    versions of the packages that shape the schema. A cached schema is only
+    served for the code version it was generated from.
+    """
+    digest = hashlib.sha256(settings.SETTINGS_MODULE.encode())
+    for name in _PACKAGES:
+        digest.update(f'{name}=={package_version(name)}'.encode())
+    for directory in _SOURCE_DIRS:
+        for path in sorted((settings.BASE_DIR / directory).rglob('*.py')):
+            if 'tests' in path.parts or 'migrations' in path.parts:
+                continue
+            digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def schema_path(api_version: Optional[str], suffix: str) -> Path:
+    return SCHEMA_DIR / f'openapi-{api_version or "default"}-{code_version()[:16]}.{suffix}'
+
+
+class RenderedSchema:
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    ``SpectacularAPIView`` that generates each schema rendering once per
+    process, or loads the one ``manage.py build_openapi_schema`` wrote for
+    the current code version, and serves it with an ETag.
+
+    Requests with ``?lang=`` are rare and generated as before.
+    """
+
+    _cache: Dict[Tuple, RenderedSchema] = {}
+    _lock = threading.Lock()
+
+    def _get_schema_response(self, request):
+        if request.GET.get('lang'):
+            return super()._get_schema_response(request)
+
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        renderer = request.accepted_renderer
+        key = (version, type(renderer))
+        schema = self._cache.get(key)
+        if schema is None:
+            with self._lock:
+                schema = self._cache.get(key) or self._load(request, version, renderer)
+                self._cache[key] = schema
+
+        response = get_conditional_response(request, etag=schema.etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(schema.body, content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, version)}"'
+        response['ETag'] = schema.etag
+        # Revalidate every time: the URL stays the same across deploys.
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def _load(self, request, version, renderer) -> RenderedSchema:
+        path = schema_path(version, renderer.format)
+        if path.is_file():
+            return RenderedSchema(path.read_bytes())
+        logger.info('Generating OpenAPI schema (%s, %s)', version, renderer.format)
+        return RenderedSchema(self.render_schema(request, version, renderer))
+
+    def render_schema(self, request, version, renderer) -> bytes:
+        generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+        data = generator.get_schema(request=request, public=self.serve_public)
+        return renderer.render(data, renderer.media_type, self.get_renderer_context())
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def save_cache(cls) -> List[Path]:
+        """Write every cached rendering to ``SCHEMA_DIR``; returns the paths."""
+        SCHEMA_DIR.mkdir(parents=True, exist_ok=True)
+        paths = []
+        with cls._lock:
+            for (version, renderer_class), schema in cls._cache.items():
+                path = schema_path(version, renderer_class.format)
+                if path not in paths:
+                    path.write_bytes(schema.body)
+                    paths.append(path)
+        return paths
@@ -20,15 +20,62 @@ class PrayerEventSerializer(serializers.Serializer):
     city = serializers.CharField()
     next_prayer = serializers.DictField(
         child=serializers.CharField(),
-        help_text='Example: {"name": "asr", "time": "15:45"}',
+        help_text='Example: {"name": "asr", "date": "2025-09-23", "time": "15:45"}',
         required=False
     )
     message = serializers.CharField(required=False)
 
 
+class UpcomingEventSerializer(serializers.Serializer):
+    name = serializers.CharField(help_text='fajr, sunrise, dhuhr, asr, maghrib, isha, tahajjud or midnight')
+    date = serializers.DateField()
+    time = serializers.CharField(help_text='HH:MM')
+
+
+class UpcomingEventsSerializer(serializers.Serializer):
+    given_datetime = serializers.DateTimeField()
+    madhab = serializers.CharField()
+    city = serializers.CharField()
+    events = UpcomingEventSerializer(many=True)
+
+
 class PrayerTimesRangeSerializer(serializers.Serializer):
     start = serializers.DateField()
     end = serializers.DateField()
     madhab = serializers.CharField()
     city = serializers.CharField()
     results = PrayerTimesSerializer(many=True)
+
+
+class MatrixDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    times = serializers.DictField(
+        child=serializers.DictField(child=serializers.DictField(child=serializers.CharField())),
+        help_text='madhab -> city -> prayer name -> time (HH:MM)'
+    )
+
+
+class MatrixSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    madhabs = serializers.ListField(child=serializers.CharField())
+    cities = serializers.ListField(child=serializers.CharField())
+    results = MatrixDaySerializer(many=True)
+
+
+class BatchQuerySerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=['date', 'next'])
+    madhab = serializers.CharField(required=False, help_text='hanafi or shafi')
+    city = serializers.CharField(required=False, help_text='colombo or others')
+    date = serializers.DateField(required=False, help_text='For "date" queries')
+    datetime = serializers.CharField(required=False, help_text='For "next" queries, ISO 8601')
+
+
+class BatchResultSerializer(serializers.Serializer):
+    status = serializers.IntegerField(help_text='Status the single endpoint would have returned')
+    data = serializers.DictField(required=False, help_text='/date/ or /next/ response body')
+    error = serializers.CharField(required=False)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    results = BatchResultSerializer(many=True)
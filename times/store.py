@@ -0,0 +1,394 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.dispatch import Signal
+
+from .compiled import COMPILED_NAME, CompiledTimetables
+from .timeline import Timeline, build_timeline
+from .timetable import (
+    DATA_DIR, LANKA_TZ, Timetable, compile_table, dataset_path, load_table,
+)
+from .timing import timed
+from .validation import VALID_CITIES, VALID_MADHABS
+
+logger = logging.getLogger(__name__)
+
+# Sent by a TimetableStore, with the new ``version``, after a reload swapped
+# in new data.
+dataset_reloaded = Signal()
+
+
+def _datasets() -> List[Tuple[str, str]]:
+    return [(madhab, city) for madhab in sorted(VALID_MADHABS) for city in sorted(VALID_CITIES)]
+
+
+class DatasetYear:
+    """Every madhab/city timetable of one year, with their timelines."""
+
+    __slots__ = ('year', 'tables', 'timelines')
+
+    def __init__(self, year: int, tables: Dict[Tuple[str, str], Timetable],
+                 timelines: Dict[Tuple[str, str], Timeline]):
+        self.year = year
+        self.tables = tables
+        self.timelines = timelines
+
+    @property
+    def nbytes(self) -> Dict[str, int]:
+        return {
+            f'{self.year}/{madhab}.{city}': table.nbytes + self.timelines[(madhab, city)].nbytes
+            for (madhab, city), table in self.tables.items()
+        }
+
+
+class Snapshot:
+    """
+    One version of the datasets on disk: the years available, the compiled
+    file if it matches them, and the years compiled so far (an LRU).
+
+    With ``perennial`` set, years after the last dataset up to the next
+    Colombo year are served from the last dataset: the ACJU tables repeat
+    every year.
+
+    A snapshot never changes what it answers; a reload builds a new one.
+    """
+
+    def __init__(self, data_dir: Path, max_years: int, available: Dict[int, Dict[Tuple[str, str], str]],
+                 version: str, last_modified: float, compiled: Optional[CompiledTimetables],
+                 perennial: bool = False):
+        self.data_dir = data_dir
+        self.max_years = max_years
+        self.available = available
+        self.perennial = perennial
+        # Hash over every dataset file's SHA-256, and the newest file mtime.
+        self.version = version
+        self.last_modified = last_modified
+        self.compiled = compiled
+        self.resident: 'OrderedDict[int, DatasetYear]' = OrderedDict()
+        self.year_load_ms: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def source_year(self, year: int) -> Optional[int]:
+        """The dataset year ``year`` is served from, or None when it has no data."""
+        if year in self.available:
+            return year
+        if not self.perennial or year > datetime.now(LANKA_TZ).year + 1:
+            return None
+        return max((y for y in self.available if y < year), default=None)
+
+    @timed('load')
+    def _compile_year(self, year: int) -> DatasetYear:
+        started = time.perf_counter()
+        source, next_source = self.source_year(year), self.source_year(year + 1)
+        tables, timelines = {}, {}
+        for madhab, city in _datasets():
+            if self.compiled is not None and self.compiled.has(madhab, city, year):
+                data = self.compiled.data(madhab, city, year)
+            else:
+                next_year_fajr = None
+                if next_source is not None:
+                    next_year_fajr = load_table(madhab, city, next_source, self.data_dir)[0][0][0]
+                raw = load_table(madhab, city, source, self.data_dir)
+                data = compile_table(raw, year, next_year_fajr)
+            table = Timetable(madhab, city, year, data)
+            tables[(madhab, city)] = table
+            timelines[(madhab, city)] = build_timeline(table)
+        self.year_load_ms[year] = (time.perf_counter() - started) * 1000
+        return DatasetYear(year, tables, timelines)
+
+    def year(self, year: int) -> DatasetYear:
+        data = self.resident.get(year)
+        if data is not None:
+            try:
+                self.resident.move_to_end(year)
+            except KeyError:  # evicted by another thread meanwhile
+                pass
+            return data
+
+        with self._lock:
+            data = self.resident.get(year)
+            if data is None:
+                data = self._compile_year(year)
+                self.resident[year] = data
+                while len(self.resident) > self.max_years:
+                    evicted, _ = self.resident.popitem(last=False)
+                    logger.info('Evicted prayer time year %s', evicted)
+            return data
+
+
+class TimetableStore:
+    """
+    Process-wide, read-only holder of the madhab/city datasets, one
+    directory per year.
+
+    ``load()`` is called once from ``TimesConfig.ready()``: it indexes the
+    years on disk and compiles the current one, so requests for it never
+    touch the disk. Other years are compiled on first access and kept in a
+    small LRU. Lookups also load on first use for code that runs without the
+    app registry (scripts, shells).
+
+    When ``manage.py compile_timetables`` has written an up-to-date
+    ``timetables.bin``, years are read from it through ``mmap`` instead of
+    being parsed from JSON.
+
+    Everything is answered from the current ``Snapshot``. ``reload()``
+    builds a new one from the files on disk and swaps it in with a single
+    assignment, then sends ``dataset_reloaded``. Code that must see one
+    version throughout, such as a request, runs inside ``pinned()``.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, max_years: int = 3, use_compiled: bool = True,
+                 perennial: bool = False):
+        self.data_dir = data_dir
+        self.max_years = max_years
+        self.use_compiled = use_compiled
+        self.perennial = perennial
+        self._snapshot: Optional[Snapshot] = None
+        self._pinned: ContextVar[Optional[Snapshot]] = ContextVar('pinned_snapshot', default=None)
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._load_seconds: Optional[float] = None
+        self._signature: Optional[Tuple] = None
+        self.reloads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def current(self) -> Snapshot:
+        """The pinned snapshot, else the latest one."""
+        snapshot = self._pinned.get()
+        if snapshot is not None:
+            return snapshot
+        if self._snapshot is None:
+            self.load()
+        return self._snapshot
+
+    @contextmanager
+    def pinned(self, snapshot: Optional[Snapshot] = None) -> Iterator[Snapshot]:
+        """Answer from ``snapshot`` (default: the current one) inside the block."""
+        snapshot = snapshot or self.current()
+        token = self._pinned.set(snapshot)
+        try:
+            yield snapshot
+        finally:
+            self._pinned.reset(token)
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+    @property
+    def last_modified(self) -> float:
+        return self.current().last_modified
+
+    @timed('load')
+    def load(self) -> None:
+        with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            self._signature = self._stat_signature()
+            self._snapshot = self._scan()
+            self._load_seconds = time.perf_counter() - started
+
+        self._make_resident(self._snapshot)
+        current = datetime.now(LANKA_TZ).year
+        source = self._snapshot.source_year(current)
+        if source is None:
+            logger.warning('No prayer time dataset for the current year %s', current)
+        elif source != current:
+            logger.warning('No prayer time dataset for %s; serving the perennial %s tables', current, source)
+        stats = self.stats()
+        logger.info(
+            'Indexed prayer time datasets for %s in %.1f ms; resident: %s (%d bytes)',
+            stats['available_years'], stats['load_ms'], stats['resident_years'],
+            stats['memory_bytes'],
+        )
+
+    @staticmethod
+    def _make_resident(snapshot: Snapshot, years: Iterable[int] = ()) -> None:
+        current = datetime.now(LANKA_TZ).year
+        for year in sorted({current, current + 1, *years}):
+            if snapshot.source_year(year) is not None:
+                snapshot.year(year)
+
+    def _year_dirs(self) -> List[Path]:
+        return [p for p in self.data_dir.iterdir() if p.is_dir() and p.name.isdigit()]
+
+    def _scan(self) -> Snapshot:
+        available = {}
+        digest = hashlib.sha256()
+        last_modified = 0.0
+        for year in sorted(int(p.name) for p in self._year_dirs()):
+            paths = {key: dataset_path(*key, year, self.data_dir) for key in _datasets()}
+            missing = [p.name for p in paths.values() if not p.is_file()]
+            if len(missing) == len(paths):  # an empty directory holds no data to lose
+                continue
+            if missing:
+                raise ValueError(f'Prayer time year {year} is incomplete: missing {", ".join(missing)}')
+            hashes = {}
+            for key, path in paths.items():
+                hashes[key] = hashlib.sha256(path.read_bytes()).hexdigest()
+                digest.update(f'{year}/{path.name}:{hashes[key]}'.encode())
+                last_modified = max(last_modified, path.stat().st_mtime)
+            available[year] = hashes
+        version = digest.hexdigest()
+        compiled = self._open_compiled(version) if self.use_compiled else None
+        return Snapshot(self.data_dir, self.max_years, available, version, last_modified, compiled,
+                        self.perennial)
+
+    def _open_compiled(self, version: str) -> Optional[CompiledTimetables]:
+        path = self.data_dir / COMPILED_NAME
+        if not path.is_file():
+            return None
+        try:
+            compiled = CompiledTimetables(path)
+        except (OSError, ValueError) as e:
+            logger.warning('Ignoring compiled timetables: %s', e)
+            return None
+        if compiled.checksum != version:
+            logger.warning(
+                'Ignoring stale %s; run "manage.py compile_timetables" to rebuild it', path
+            )
+            return None
+        return compiled
+
+    def _stat_signature(self) -> Tuple:
+        """Cheap fingerprint of the dataset files: names, sizes and mtimes."""
+        entries = []
+        for directory in sorted(self._year_dirs()):
+            for path in sorted(directory.glob('*.json')):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:  # replaced while we looked
+                    continue
+                entries.append((str(path), st.st_size, st.st_mtime_ns))
+        compiled = self.data_dir / COMPILED_NAME
+        if compiled.is_file():
+            st = compiled.stat()
+            entries.append((str(compiled), st.st_size, st.st_mtime_ns))
+        return tuple(entries)
+
+    def changed(self) -> bool:
+        """Whether any dataset file looks different since the last (re)load."""
+        return self._stat_signature() != self._signature
+
+    def reload(self) -> bool:
+        """
+        Rebuild from the files on disk and swap the result in when its
+        version differs. The new snapshot's resident years are compiled
+        before the swap, so no request waits for them. Returns whether the
+        version changed.
+        """
+        if not self.loaded:
+            self.load()
+            return False
+        with self._reload_lock:
+            previous = self._snapshot
+            signature = self._stat_signature()
+            snapshot = self._scan()
+            self._signature = signature
+            if snapshot.version == previous.version:
+                return False
+            self._make_resident(snapshot, list(previous.resident))
+            self._snapshot = snapshot
+            self.reloads += 1
+
+        logger.info('Reloaded prayer time datasets: version %s -> %s, years %s',
+                    previous.version[:16], snapshot.version[:16], sorted(snapshot.available))
+        dataset_reloaded.send(sender=self, version=snapshot.version)
+        return True
+
+    def has_year(self, year: int) -> bool:
+        return self.current().source_year(year) is not None
+
+    @property
+    def years(self) -> List[int]:
+        """Years with data, perennial ones included."""
+        snapshot = self.current()
+        current = datetime.now(LANKA_TZ).year
+        served = set(snapshot.available)
+        if snapshot.perennial and served:
+            served.update(range(min(served), current + 2))
+        return sorted(served)
+
+    def table(self, madhab: str, city: str, year: int) -> Timetable:
+        """Raises KeyError when ``year`` has no dataset; check ``has_year`` first."""
+        snapshot = self.current()
+        if snapshot.source_year(year) is None:
+            raise KeyError(year)
+        return snapshot.year(year).tables[(madhab, city)]
+
+    def timeline(self, madhab: str, city: str, year: int) -> Timeline:
+        snapshot = self.current()
+        if snapshot.source_year(year) is None:
+            raise KeyError(year)
+        return snapshot.year(year).timelines[(madhab, city)]
+
+    def stats(self) -> Dict:
+        """Load times and approximate resident size, for monitoring."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {
+                'loaded': False, 'version': '', 'compiled': None, 'load_ms': 0.0,
+                'year_load_ms': {}, 'available_years': [], 'resident_years': [],
+                'datasets': {}, 'memory_bytes': 0, 'reloads': self.reloads,
+            }
+        datasets = {}
+        for data in list(snapshot.resident.values()):
+            datasets.update(data.nbytes)
+        return {
+            'loaded': True,
+            'version': snapshot.version,
+            'compiled': str(snapshot.compiled.path) if snapshot.compiled else None,
+            'load_ms': (self._load_seconds or 0.0) * 1000,
+            'year_load_ms': dict(snapshot.year_load_ms),
+            'available_years': sorted(snapshot.available),
+            'resident_years': list(snapshot.resident),
+            'datasets': datasets,
+            'memory_bytes': sum(datasets.values()),
+            'reloads': self.reloads,
+        }
+
+
+class DatasetWatcher(threading.Thread):
+    """
+    Polls the data directory every ``interval`` seconds and reloads the
+    store when a file changed. A reload that fails, say on a file caught
+    half-written, is logged and tried again once the files change again;
+    the old snapshot keeps serving meanwhile.
+    """
+
+    def __init__(self, store: TimetableStore, interval: float):
+        super().__init__(name='times-dataset-watcher', daemon=True)
+        self.store = store
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                if self.store.changed():
+                    self.store.reload()
+            except Exception:
+                logger.exception('Reloading prayer time datasets failed; keeping version %s',
+                                 self.store.version[:16])
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+timetable_store = TimetableStore(
+    max_years=getattr(settings, 'TIMES_MAX_RESIDENT_YEARS', 3),
+    perennial=getattr(settings, 'TIMES_PERENNIAL_FALLBACK', True),
+)
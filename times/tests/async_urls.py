@@ -0,0 +1,5 @@
+from django.urls import include, path
+
+from times.urls import async_urlpatterns
+
+urlpatterns = [path('api/v1/', include(async_urlpatterns))]
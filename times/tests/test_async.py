@@ -0,0 +1,77 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from prayer_api import settings_asgi
+
+CASES = [
+    ('/api/v1/times/today/', {'madhab': 'hanafi'}),
+    ('/api/v1/times/date/', {'city': 'others', 'date': '2026-09-23'}),
+    ('/api/v1/times/date/', {'date': '2026-13-01'}),
+    ('/api/v1/times/date/', {'madhab': 'maliki', 'date': '2026-01-01'}),
+    ('/api/v1/times/next/', {'datetime': '2026-09-23T20:00'}),
+    ('/api/v1/times/next/', {}),
+    ('/api/v1/times/upcoming/', {'datetime': '2026-09-23T20:00', 'hours': 24}),
+    ('/api/v1/times/upcoming/', {'datetime': '2026-09-23T20:00', 'count': 0}),
+    ('/api/v1/times/range/', {'start': '2026-12-30', 'end': '2027-01-02'}),
+    ('/api/v1/times/range/', {'start': '2026-03-02', 'end': '2026-03-01'}),
+    ('/api/v1/times/range/', {'start': '0001-01-01', 'end': '9999-12-31'}),
+    ('/api/v1/times/matrix/', {'date': '2026-09-23'}),
+]
+
+
+class TestAsyncViews(SimpleTestCase):
+
+    async def get_async(self, url, params, **extra):
+        with self.settings(ROOT_URLCONF='times.tests.async_urls'):
+            return await self.async_client.get(url, params, **extra)
+
+    async def test_same_responses_as_drf_views(self):
+        for url, params in CASES:
+            with self.subTest(url=url, params=params):
+                expected = self.client.get(url, params)
+                response = await self.get_async(url, params)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.json(), expected.json())
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+
+    async def test_batch(self):
+        queries = [{'type': 'date', 'date': '2026-09-23'}, {'type': 'next'}]
+        expected = self.client.post('/api/v1/times/batch/', queries, content_type='application/json')
+        with self.settings(ROOT_URLCONF='times.tests.async_urls'):
+            response = await self.async_client.post('/api/v1/times/batch/', queries,
+                                                     content_type='application/json')
+            invalid = await self.async_client.post('/api/v1/times/batch/', '[',
+                                                    content_type='application/json')
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(invalid.status_code, 400)
+
+    async def test_not_modified(self):
+        url, params = CASES[1]
+        etag = (await self.get_async(url, params))['ETag']
+        response = await self.get_async(url, params, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_ndjson_stream(self):
+        params = {'start': '2026-01-30', 'end': '2026-03-02'}
+        response = await self.get_async('/api/v1/times/range/', {**params, 'format': 'ndjson'})
+        self.assertTrue(response.is_async)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        expected = self.client.get('/api/v1/times/range/', params).json()['results']
+        self.assertEqual([json.loads(line) for line in body.splitlines()], expected)
+
+    async def test_only_get(self):
+        response = await self.get_async('/api/v1/times/today/', {})
+        self.assertEqual(response.status_code, 200)
+        with self.settings(ROOT_URLCONF='times.tests.async_urls'):
+            response = await self.async_client.post('/api/v1/times/today/')
+        self.assertEqual(response.status_code, 405)
+
+    async def test_asgi_middleware_stays_on_event_loop(self):
+        with self.settings(MIDDLEWARE=settings_asgi.MIDDLEWARE), \
+                mock.patch('django.utils.deprecation.sync_to_async', side_effect=AssertionError):
+            response = await self.get_async('/api/v1/times/today/', {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+URL = '/api/v1/times/batch/'
+
+
+class TestBatch(SimpleTestCase):
+
+    def post(self, queries):
+        return self.client.post(URL, queries, content_type='application/json')
+
+    def test_results_match_single_endpoints_in_order(self):
+        queries = [
+            {'type': 'next', 'madhab': 'hanafi', 'datetime': '2026-09-23T20:00'},
+            {'type': 'date', 'city': 'others', 'date': '2026-09-23'},
+            {'type': 'date', 'date': '2100-01-01'},
+            {'type': 'date', 'date': 'yesterday'},
+            {'type': 'next', 'madhab': 'maliki', 'datetime': '2026-09-23T20:00'},
+        ]
+        singles = [
+            self.client.get('/api/v1/times/next/', {'madhab': 'hanafi', 'datetime': '2026-09-23T20:00'}),
+            self.client.get('/api/v1/times/date/', {'city': 'others', 'date': '2026-09-23'}),
+            self.client.get('/api/v1/times/date/', {'date': '2100-01-01'}),
+            self.client.get('/api/v1/times/date/', {'date': 'yesterday'}),
+            self.client.get('/api/v1/times/next/', {'madhab': 'maliki', 'datetime': '2026-09-23T20:00'}),
+        ]
+        response = self.post(queries)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        self.assertEqual(len(results), len(queries))
+        for result, single in zip(results, singles):
+            self.assertEqual(result.pop('status'), single.status_code)
+            if single.status_code == status.HTTP_200_OK:
+                self.assertEqual(result['data'], single.json())
+            else:
+                self.assertEqual(result, single.json())
+
+    def test_malformed_queries(self):
+        results = self.post([
+            'date', {'type': 'month'}, {'type': 'date'}, {'type': 'next', 'datetime': 5},
+            {'type': 'date', 'madhab': 1, 'date': '2026-01-01'},
+        ]).json()['results']
+        self.assertEqual([r['status'] for r in results], [400] * 5)
+        self.assertEqual(results[1]['valid_values'], ['date', 'next'])
+        self.assertEqual(results[4]['error'], 'Invalid madhab: 1')
+
+    def test_body_must_be_an_array(self):
+        response = self.post({'type': 'date', 'date': '2026-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_max_queries(self):
+        with mock.patch('times.views.BATCH_MAX_QUERIES', 2):
+            response = self.post([{'type': 'date', 'date': '2026-01-01'}] * 3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('max 2', response.json()['error'])
+
+    def test_get_not_allowed(self):
+        self.assertEqual(self.client.get(URL).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
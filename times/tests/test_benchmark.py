@@ -0,0 +1,46 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from benchmarks import suite
+
+
+class TestBenchmarkCommand(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def benchmark(self, *args):
+        call_command('benchmark', '--quick', '--no-server', '--only', 'get_times_for_day',
+                     *args, stdout=StringIO(), stderr=StringIO())
+
+    def test_writes_json_results(self):
+        self.benchmark('--output', str(self.dir / 'run.json'))
+        results = json.loads((self.dir / 'run.json').read_text())['results']
+        self.assertEqual(list(results), ['micro: get_times_for_day'])
+        stats = results['micro: get_times_for_day']
+        self.assertGreater(stats['ops_per_sec'], 0)
+        self.assertLessEqual(stats['p50_us'], stats['p95_us'])
+        self.assertLessEqual(stats['p95_us'], stats['p99_us'])
+
+    def test_slowdown_over_threshold_fails(self):
+        baseline = self.dir / 'baseline.json'
+        baseline.write_text(json.dumps({'results': {
+            'micro: get_times_for_day': {'ops_per_sec': 1e12},
+        }}))
+        with self.assertRaisesMessage(CommandError, 'slowed down by more than 20%'):
+            self.benchmark('--compare', str(baseline))
+
+    def test_compare(self):
+        run = {'results': {'a': {'ops_per_sec': 80.0}, 'b': {'ops_per_sec': 100.0}}}
+        baseline = {'results': {'a': {'ops_per_sec': 100.0}, 'b': {'ops_per_sec': 100.0}}}
+        [(name, before, after, change)] = suite.compare(run, baseline, 0.1)
+        self.assertEqual((name, before, after), ('a', 100.0, 80.0))
+        self.assertAlmostEqual(change, -0.2)
+        self.assertEqual(suite.compare(run, baseline, 0.25), [])
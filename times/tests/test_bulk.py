@@ -0,0 +1,74 @@
+import gzip
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times import bulk
+from times.bulk import accepted_encodings, bulk_payloads
+
+
+class TestBulkEndpoints(SimpleTestCase):
+
+    def test_year_matches_range(self):
+        year = self.client.get('/api/v1/times/year/', {'year': 2026, 'madhab': 'hanafi'})
+        full_range = self.client.get('/api/v1/times/range/', {
+            'start': '2026-01-01', 'end': '2026-12-31', 'madhab': 'hanafi',
+        })
+        self.assertEqual(year.status_code, status.HTTP_200_OK)
+        self.assertEqual(year.content, full_range.content)
+        self.assertNotIn('Content-Encoding', year)
+        self.assertIn('Accept-Encoding', year['Vary'])
+
+    def test_every_month_matches_range(self):
+        for month, end in ((1, '2026-01-31'), (2, '2026-02-28'), (12, '2026-12-31')):
+            with self.subTest(month=month):
+                response = self.client.get('/api/v1/times/month/', {'year': 2026, 'month': month, 'city': 'others'})
+                expected = self.client.get('/api/v1/times/range/', {
+                    'start': f'2026-{month:02d}-01', 'end': end, 'city': 'others',
+                })
+                self.assertEqual(response.content, expected.content)
+
+    def test_gzip(self):
+        plain = self.client.get('/api/v1/times/year/', {'year': 2026})
+        with mock.patch.object(bulk, 'brotli', None):
+            bulk_payloads.clear()
+            response = self.client.get('/api/v1/times/year/', {'year': 2026}, HTTP_ACCEPT_ENCODING='gzip, br')
+        bulk_payloads.clear()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response['ETag'], plain['ETag'])
+        again = self.client.get('/api/v1/times/year/', {'year': 2026},
+                                HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @skipIf(bulk.brotli is None, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        plain = self.client.get('/api/v1/times/month/', {'year': 2026, 'month': 3})
+        response = self.client.get('/api/v1/times/month/', {'year': 2026, 'month': 3},
+                                   HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(bulk.brotli.decompress(response.content), plain.content)
+
+    def test_invalid_params(self):
+        for url, params, code in (
+            ('/api/v1/times/year/', {}, status.HTTP_400_BAD_REQUEST),
+            ('/api/v1/times/year/', {'year': 'this'}, status.HTTP_400_BAD_REQUEST),
+            ('/api/v1/times/month/', {'year': 2026}, status.HTTP_400_BAD_REQUEST),
+            ('/api/v1/times/month/', {'year': 2026, 'month': 13}, status.HTTP_400_BAD_REQUEST),
+            ('/api/v1/times/year/', {'year': 2026, 'madhab': 'maliki'}, status.HTTP_400_BAD_REQUEST),
+            ('/api/v1/times/year/', {'year': 2100}, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.subTest(url=url, params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, code)
+                self.assertIn('error', response.json())
+
+
+class TestAcceptEncoding(SimpleTestCase):
+
+    def test_parse(self):
+        self.assertEqual(accepted_encodings('gzip, deflate, br'), {'gzip', 'deflate', 'br'})
+        self.assertEqual(accepted_encodings('br;q=0, gzip;q=0.5'), {'gzip'})
+        self.assertEqual(accepted_encodings('*'), {'br', 'gzip'})
+        self.assertEqual(accepted_encodings(''), set())
@@ -0,0 +1,60 @@
+from calendar import isleap
+from datetime import date, datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from times import cache as cache_module
+from times.cache import ResponseCache, response_cache, warm_response_cache
+from times.store import timetable_store
+from times.utils import LANKA_TZ, lanka_today
+
+
+class TestResponseCache(SimpleTestCase):
+
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache(max_entries=2)
+        render = mock.Mock(return_value=b'{}')
+        cache.get_or_render('a', render)
+        cache.get_or_render('a', render)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', b'a')
+        cache.put('b', b'b')
+        cache.get_or_render('a', lambda: b'x')  # refresh 'a'
+        cache.put('c', b'c')
+        self.assertEqual(cache.get_or_render('a', lambda: b'x'), b'a')
+        self.assertEqual(cache.get_or_render('b', lambda: b'new'), b'new')
+        self.assertEqual(len(cache), 2)
+
+    def test_date_endpoint_served_from_cache(self):
+        params = {'madhab': 'hanafi', 'city': 'colombo', 'date': '2026-03-14'}
+        first = self.client.get('/api/v1/times/date/', params)
+        hits = response_cache.hits
+        second = self.client.get('/api/v1/times/date/', params)
+        self.assertEqual(response_cache.hits, hits + 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_warm_renders_every_day(self):
+        with mock.patch.object(cache_module, 'response_cache', ResponseCache(max_entries=4096)):
+            days = sum(366 if isleap(year) else 365 for year in timetable_store.stats()['resident_years'])
+            self.assertEqual(warm_response_cache(), 4 * days)
+
+
+class TestToday(SimpleTestCase):
+
+    def test_lanka_today_uses_colombo_date(self):
+        # 20:00 UTC on Sep 23 is already Sep 24 in Colombo (UTC+05:30).
+        utc_evening = datetime(2026, 9, 23, 20, 0, tzinfo=timezone.utc)
+        with mock.patch('times.utils.datetime') as fake:
+            fake.now.return_value = utc_evening.astimezone(LANKA_TZ)
+            self.assertEqual(lanka_today(), date(2026, 9, 24))
+
+    def test_today_rolls_over_with_colombo_date(self):
+        with mock.patch('times.views.lanka_today', return_value=date(2026, 9, 24)):
+            response = self.client.get('/api/v1/times/today/', {'madhab': 'shafi', 'city': 'colombo'})
+        self.assertEqual(response.json()['date'], '2026-09-24')
@@ -0,0 +1,59 @@
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from times.compiled import COMPILED_NAME, CompiledTimetables, write_compiled
+from times.store import TimetableStore, _datasets
+from times.timetable import DATA_DIR, dataset_path
+
+
+class TestCompiledTimetables(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        shutil.copytree(DATA_DIR / '2026', self.data_dir / '2026')
+        self.json_store = TimetableStore(self.data_dir, use_compiled=False)
+
+    def compile(self):
+        tables = [self.json_store.table(m, c, 2026) for m, c in _datasets()]
+        write_compiled(self.data_dir / COMPILED_NAME, self.json_store.version, tables)
+
+    def test_round_trip_matches_json_compile(self):
+        self.compile()
+        compiled = CompiledTimetables(self.data_dir / COMPILED_NAME)
+        self.assertEqual(compiled.years, [2026])
+        self.assertEqual(compiled.checksum, self.json_store.version)
+        for m, c in _datasets():
+            self.assertEqual(list(compiled.data(m, c, 2026)),
+                             list(self.json_store.table(m, c, 2026).data))
+
+    def test_store_reads_fresh_file_through_mmap(self):
+        self.compile()
+        store = TimetableStore(self.data_dir)
+        table = store.table('shafi', 'colombo', 2026)
+        self.assertIsInstance(table.data, memoryview)
+        d = date(2026, 9, 23)
+        self.assertEqual(list(table.row(d)),
+                         list(self.json_store.table('shafi', 'colombo', 2026).row(d)))
+
+    def test_stale_file_is_ignored(self):
+        self.compile()
+        path = dataset_path('shafi', 'colombo', 2026, self.data_dir)
+        path.write_text(path.read_text().replace(' ', ''))
+        store = TimetableStore(self.data_dir)
+        with self.assertLogs('times.store', 'WARNING'):
+            store.load()
+        self.assertIsNone(store.stats()['compiled'])
+        self.assertNotIsInstance(store.table('shafi', 'colombo', 2026).data, memoryview)
+
+    def test_corrupt_file_is_ignored(self):
+        (self.data_dir / COMPILED_NAME).write_bytes(b'garbage')
+        store = TimetableStore(self.data_dir)
+        with self.assertLogs('times.store', 'WARNING'):
+            store.load()
+        self.assertIsNone(store.stats()['compiled'])
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times.conditional import RELOADABLE_MAX_AGE
+from times.store import timetable_store
+from times.utils import LANKA_TZ
+
+DATE_PARAMS = {'madhab': 'shafi', 'city': 'colombo', 'date': '2026-09-23'}
+
+
+class TestConditionalRequests(SimpleTestCase):
+
+    def test_date_is_immutable_with_etag(self):
+        response = self.client.get('/api/v1/times/date/', DATE_PARAMS)
+        self.assertTrue(response['ETag'].startswith(f'"{timetable_store.version[:16]}-'))
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Last-Modified', response)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get('/api/v1/times/date/', DATE_PARAMS)['ETag']
+        response = self.client.get('/api/v1/times/date/', DATE_PARAMS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_query(self):
+        first = self.client.get('/api/v1/times/date/', DATE_PARAMS)['ETag']
+        other = self.client.get('/api/v1/times/date/', {**DATE_PARAMS, 'city': 'others'})['ETag']
+        self.assertNotEqual(first, other)
+
+    def test_range_304(self):
+        params = {'madhab': 'hanafi', 'city': 'others', 'start': '2026-01-01', 'end': '2026-01-31'}
+        etag = self.client.get('/api/v1/times/range/', params)['ETag']
+        with mock.patch('times.views.get_times_for_range') as engine:
+            response = self.client.get('/api/v1/times/range/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        engine.assert_not_called()
+
+    def test_today_expires_at_colombo_midnight(self):
+        response = self.client.get('/api/v1/times/today/', {'madhab': 'shafi', 'city': 'colombo'})
+        max_age = int(response['Cache-Control'].split('max-age=')[1])
+        now = datetime.now(LANKA_TZ)
+        midnight = LANKA_TZ.localize(datetime.combine(now.date() + timedelta(days=1), datetime.min.time()))
+        self.assertAlmostEqual(max_age, (midnight - now).total_seconds(), delta=2)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertIn('Expires', response)
+
+    def test_next_expires_at_returned_prayer(self):
+        now = datetime.now(LANKA_TZ).replace(tzinfo=None, second=0, microsecond=0)
+        response = self.client.get('/api/v1/times/next/', {
+            'madhab': 'shafi', 'city': 'colombo', 'datetime': now.isoformat(timespec='minutes'),
+        })
+        if response.status_code != status.HTTP_200_OK:
+            self.skipTest('current date is outside the dataset')
+        event = response.json()['next_prayer']
+        at = LANKA_TZ.localize(datetime.fromisoformat(f"{event['date']}T{event['time']}"))
+        max_age = int(response['Cache-Control'].split('max-age=')[1])
+        self.assertAlmostEqual(max_age, (at - datetime.now(LANKA_TZ)).total_seconds(), delta=2)
+
+    def test_next_in_the_past_is_immutable(self):
+        response = self.client.get('/api/v1/times/next/', {
+            'madhab': 'shafi', 'city': 'colombo', 'datetime': '2026-01-02T12:00',
+        })
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_errors_are_not_cached(self):
+        response = self.client.get('/api/v1/times/date/', {**DATE_PARAMS, 'date': '2100-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+    def test_preconditions_do_not_hide_a_404(self):
+        params = {**DATE_PARAMS, 'date': '2100-01-01'}
+        for headers in ({'HTTP_IF_NONE_MATCH': '*'},
+                        {'HTTP_IF_MODIFIED_SINCE': 'Fri, 01 Jan 2100 00:00:00 GMT'}):
+            with self.subTest(headers=headers):
+                response = self.client.get('/api/v1/times/date/', params, **headers)
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@mock.patch('times.conditional.RELOADABLE', True)
+class TestReloadableCaching(SimpleTestCase):
+
+    def test_nothing_is_immutable(self):
+        for url, params in (
+            ('/api/v1/times/date/', DATE_PARAMS),
+            ('/api/v1/times/year/', {'year': 2026}),
+            ('/api/v1/times/next/', {'datetime': '2026-01-02T12:00'}),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url, params)
+                self.assertNotIn('immutable', response['Cache-Control'])
+                self.assertLessEqual(int(response['Cache-Control'].split('max-age=')[1]), RELOADABLE_MAX_AGE)
+                again = self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_today_is_capped(self):
+        response = self.client.get('/api/v1/times/today/')
+        self.assertLessEqual(int(response['Cache-Control'].split('max-age=')[1]), RELOADABLE_MAX_AGE)
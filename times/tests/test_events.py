@@ -0,0 +1,95 @@
+import asyncio
+import json
+import time
+from datetime import date, datetime
+
+from django.test import SimpleTestCase
+
+from times.events import EventHub
+from times.utils import LANKA_TZ, get_times_for_day
+
+URL = '/api/v1/times/events/'
+
+
+def epoch(d: date, hhmm: str) -> float:
+    return LANKA_TZ.localize(datetime.combine(d, datetime.strptime(hhmm, '%H:%M').time())).timestamp()
+
+
+def parse(frame: bytes) -> dict:
+    fields = dict(line.split(': ', 1) for line in frame.decode().strip().split('\n'))
+    if 'data' in fields:
+        fields['data'] = json.loads(fields['data'])
+    return fields
+
+
+class TestEventHub(SimpleTestCase):
+    day = date(2026, 9, 23)
+
+    def hub_at(self, moment: float) -> EventHub:
+        offset = moment - time.time()
+        return EventHub(clock=lambda: time.time() + offset)
+
+    async def test_pushes_prayer_when_reached(self):
+        times = get_times_for_day(self.day, 'shafi', 'colombo')
+        maghrib = epoch(self.day, times.maghrib)
+        hub = self.hub_at(maghrib - 0.05)
+        stream = hub.stream('shafi', 'colombo')
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        announced = parse(await anext(stream))
+        self.assertEqual(announced['event'], 'next')
+        self.assertEqual(announced['data']['name'], 'maghrib')
+        self.assertEqual(hub.subscribers('shafi', 'colombo'), 1)
+
+        reached = parse(await asyncio.wait_for(anext(stream), 2))
+        self.assertEqual((reached['event'], reached['id']), ('prayer', str(int(maghrib))))
+        self.assertEqual(reached['data'], {
+            'name': 'maghrib', 'date': '2026-09-23', 'time': times.maghrib,
+            'madhab': 'shafi', 'city': 'colombo',
+        })
+        following = parse(await anext(stream))
+        self.assertEqual((following['event'], following['data']['name']), ('next', 'isha'))
+
+        await stream.aclose()
+        self.assertEqual(hub.subscribers('shafi', 'colombo'), 0)
+        self.assertEqual(hub._channels, {})
+
+    async def test_one_timer_per_pair(self):
+        hub = self.hub_at(epoch(self.day, '12:00'))
+        queues = [hub.subscribe('shafi', 'colombo') for _ in range(3)] + [hub.subscribe('hanafi', 'colombo')]
+        self.assertEqual(len(hub._channels), 2)
+        self.assertEqual(hub.subscribers('shafi', 'colombo'), 3)
+        for queue, pair in zip(queues, [('shafi', 'colombo')] * 3 + [('hanafi', 'colombo')]):
+            hub.unsubscribe(*pair, queue)
+        self.assertEqual(hub._channels, {})
+
+    async def test_last_event_id_replays_missed_prayers(self):
+        times = get_times_for_day(self.day, 'shafi', 'colombo')
+        hub = self.hub_at(epoch(self.day, '20:00'))
+        stream = hub.stream('shafi', 'colombo', str(int(epoch(self.day, times.dhuhr))))
+        await anext(stream)
+        names = []
+        while (frame := parse(await anext(stream)))['event'] == 'prayer':
+            names.append(frame['data']['name'])
+        await stream.aclose()
+        self.assertEqual(names, ['asr', 'maghrib', 'isha'])
+        self.assertEqual(frame['data']['name'], 'midnight')
+
+
+class TestEventsEndpoint(SimpleTestCase):
+
+    def test_sync_deployment_answers_501(self):
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, 501)
+        self.assertIn('ASGI', response.json()['error'])
+
+    async def test_async_stream(self):
+        with self.settings(ROOT_URLCONF='times.tests.async_urls'):
+            response = await self.async_client.get(URL, {'madhab': 'hanafi', 'city': 'others'})
+            invalid = await self.async_client.get(URL, {'madhab': 'maliki'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        content = aiter(response.streaming_content)
+        self.assertEqual(await anext(content), b'retry: 5000\n\n')
+        await content.aclose()
+        self.assertEqual(invalid.status_code, 400)
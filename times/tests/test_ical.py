@@ -0,0 +1,81 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times.store import timetable_store
+from times.utils import get_times_for_day
+
+URL = '/api/v1/times/calendar.ics'
+
+
+class TestCalendarExport(SimpleTestCase):
+
+    def get(self, **params):
+        return self.client.get(URL, params, HTTP_ACCEPT='text/calendar')
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_events(self):
+        response = self.get(madhab='hanafi', start='2026-09-23', end='2026-09-24')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = self.read(response)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertNotIn('\n', body.replace('\r\n', ''))
+
+        lines = body.split('\r\n')
+        uids = [line for line in lines if line.startswith('UID:')]
+        self.assertEqual(len(uids), 2 * 6)
+        self.assertEqual(len(set(uids)), len(uids))
+        self.assertEqual(lines.count('BEGIN:VEVENT'), lines.count('END:VEVENT'))
+
+        # Colombo is UTC+05:30.
+        maghrib = get_times_for_day(date(2026, 9, 24), 'hanafi', 'colombo').maghrib
+        hours, minutes = divmod(int(maghrib[:2]) * 60 + int(maghrib[3:]) - 330, 60)
+        i = lines.index('UID:2026-09-24-maghrib-hanafi-colombo@prayer-api')
+        self.assertIn(f'DTSTART:20260924T{hours:02d}{minutes:02d}00Z', lines[i:i + 4])
+
+    def test_defaults_to_the_whole_dataset(self):
+        body = self.read(self.get())
+        years = timetable_store.years
+        days = (date(years[-1], 12, 31) - date(years[0], 1, 1)).days + 1
+        self.assertEqual(body.count('BEGIN:VEVENT'), days * 6)
+        self.assertIn('UID:2026-01-01-fajr-shafi-colombo@prayer-api', body)
+        self.assertIn(f'UID:{years[-1]}-12-31-isha-shafi-colombo@prayer-api', body)
+
+    def test_revalidation(self):
+        response = self.get(start='2026-03-01', end='2026-03-31')
+        self.assertIn(response['Cache-Control'], ('public, max-age=21600', 'public, max-age=21599'))
+        again = self.client.get(URL, {'start': '2026-03-01', 'end': '2026-03-31'},
+                                HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        other = self.get(start='2026-03-01', end='2026-03-30')
+        self.assertNotEqual(other['ETag'], response['ETag'])
+
+    def test_days_without_data_are_skipped(self):
+        last = timetable_store.years[-1]
+        body = self.read(self.get(start=f'{last}-12-31', end=f'{last + 1}-01-02'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 6)
+
+    def test_range_ending_at_the_end_of_the_calendar(self):
+        response = self.get(start='9999-12-20', end='9999-12-31')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = self.read(response)
+        self.assertNotIn('BEGIN:VEVENT', body)
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+
+    def test_invalid_params(self):
+        for params in (
+            {'start': '2026-13-01'},
+            {'start': '2026-03-02', 'end': '2026-03-01'},
+            {'start': '2000-01-01', 'end': '2100-01-01'},
+            {'city': 'kandy'},
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('error', response.json())
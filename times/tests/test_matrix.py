@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times import views
+
+URL = '/api/v1/times/matrix/'
+
+
+class TestMatrix(SimpleTestCase):
+
+    def test_every_combination(self):
+        response = self.client.get(URL, {'date': '2026-09-23'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['madhabs'], ['hanafi', 'shafi'])
+        self.assertEqual(data['cities'], ['colombo', 'others'])
+        self.assertEqual(len(data['results']), 1)
+        for madhab in data['madhabs']:
+            for city in data['cities']:
+                with self.subTest(madhab=madhab, city=city):
+                    single = self.client.get('/api/v1/times/date/', {
+                        'date': '2026-09-23', 'madhab': madhab, 'city': city,
+                    }).json()
+                    self.assertEqual(data['results'][0]['times'][madhab][city], single['times'])
+
+    def test_range_matches_range_endpoint(self):
+        data = self.client.get(URL, {'start': '2026-12-30', 'end': '2027-01-01'}).json()
+        expected = self.client.get('/api/v1/times/range/', {
+            'start': '2026-12-30', 'end': '2027-01-01', 'madhab': 'hanafi', 'city': 'others',
+        }).json()['results']
+        self.assertEqual([row['date'] for row in data['results']], ['2026-12-30', '2026-12-31', '2027-01-01'])
+        self.assertEqual([row['times']['hanafi']['others'] for row in data['results']],
+                         [row['times'] for row in expected])
+
+    def test_follows_validation(self):
+        with mock.patch.object(views, 'VALID_CITIES', {'colombo'}):
+            data = self.client.get(URL, {'date': '2026-09-23'}).json()
+        self.assertEqual(data['cities'], ['colombo'])
+        self.assertEqual(set(data['results'][0]['times']['shafi']), {'colombo'})
+
+    def test_revalidation(self):
+        response = self.client.get(URL, {'date': '2026-09-23'})
+        again = self.client.get(URL, {'date': '2026-09-23'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalid_params(self):
+        for params, code in (
+            ({}, status.HTTP_400_BAD_REQUEST),
+            ({'date': '2026-13-01'}, status.HTTP_400_BAD_REQUEST),
+            ({'date': '2026-09-23', 'start': '2026-09-23'}, status.HTTP_400_BAD_REQUEST),
+            ({'start': '2026-09-23'}, status.HTTP_400_BAD_REQUEST),
+            ({'start': '2026-03-02', 'end': '2026-03-01'}, status.HTTP_400_BAD_REQUEST),
+            ({'start': '2026-01-01', 'end': '2027-12-31'}, status.HTTP_400_BAD_REQUEST),
+            ({'date': '2100-01-01'}, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(URL, params)
+                self.assertEqual(response.status_code, code)
+                self.assertIn('error', response.json())
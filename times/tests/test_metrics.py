@@ -0,0 +1,96 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from times.metrics import BUCKETS, RequestMetrics, request_metrics
+
+
+def sample(text, name, **labels):
+    """Value of the sample ``name`` whose labels include ``labels``."""
+    wanted = [f'{key}="{value}"' for key, value in labels.items()]
+    for line in text.splitlines():
+        if line.startswith(name + '{') or line.startswith(name + ' '):
+            if all(label in line for label in wanted):
+                return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class TestMetricsEndpoint(SimpleTestCase):
+
+    def setUp(self):
+        request_metrics.reset()
+
+    def scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_counted_by_endpoint_status_and_dataset(self):
+        self.client.get('/api/v1/times/today/')
+        self.client.get('/api/v1/times/date/', {'date': '2026-09-23', 'madhab': 'HANAFI', 'city': 'others'})
+        self.client.get('/api/v1/times/date/', {'date': '2026-09-23', 'madhab': 'maliki'})
+        text = self.scrape()
+
+        total = 'times_http_requests_total'
+        self.assertEqual(sample(text, total, endpoint='/api/v1/times/today/', status='200',
+                                madhab='shafi', city='colombo'), 1)
+        self.assertEqual(sample(text, total, endpoint='/api/v1/times/date/', status='200',
+                                madhab='hanafi', city='others'), 1)
+        # Unknown values share one label so clients cannot grow the series.
+        self.assertEqual(sample(text, total, endpoint='/api/v1/times/date/', status='400',
+                                madhab='invalid'), 1)
+        self.assertEqual(sample(text, 'times_http_request_duration_seconds_count',
+                                endpoint='/api/v1/times/today/'), 1)
+        self.client.get('/api/v1/times/matrix/', {'date': '2026-09-23'})
+        text = self.scrape()
+        self.assertEqual(sample(text, total, endpoint='/api/v1/times/matrix/', madhab='none', city='none'), 1)
+        self.assertEqual(sample(text, total, endpoint='/metrics', madhab='none', city='none'), 1)
+        self.assertEqual(sample(text, 'times_http_request_duration_seconds_bucket',
+                                endpoint='/api/v1/times/today/', le='+Inf'), 1)
+        # The scrape itself is in flight while it renders.
+        self.assertEqual(sample(text, 'times_http_requests_in_flight'), 1)
+
+    def test_dataset_and_cache_gauges(self):
+        self.client.get('/api/v1/times/date/', {'date': '2026-09-23'})
+        self.client.get('/api/v1/times/date/', {'date': '2026-09-23'})
+        text = self.scrape()
+        self.assertIsNotNone(sample(text, 'times_dataset_load_seconds', year='2026'))
+        self.assertGreater(sample(text, 'times_dataset_resident_bytes'), 0)
+        ratio = sample(text, 'times_response_cache_hit_ratio')
+        self.assertTrue(0 < ratio <= 1)
+
+
+class TestRequestMetrics(SimpleTestCase):
+
+    def test_histogram_buckets(self):
+        metrics = RequestMetrics()
+        labels = ('/x/', 'GET', '200', 'shafi', 'colombo')
+        for seconds in (0.0001, BUCKETS[3], 10.0):
+            metrics.finished(metrics.started(), labels, seconds)
+        requests, durations, in_flight = metrics.snapshot()
+        counts = durations[labels]
+        self.assertEqual(requests[labels], 3)
+        self.assertEqual(in_flight, 0)
+        self.assertEqual(counts[0], 1)
+        self.assertEqual(counts[3], 1)  # upper bounds are inclusive
+        self.assertEqual(counts[len(BUCKETS)], 1)  # +Inf
+        self.assertAlmostEqual(counts[-1], 0.0001 + BUCKETS[3] + 10.0)
+
+    def test_shards_of_finished_threads_are_kept(self):
+        metrics = RequestMetrics()
+        labels = ('/x/', 'GET', '200', 'shafi', 'colombo')
+
+        def work():
+            for _ in range(100):
+                metrics.finished(metrics.started(), labels, 0.001)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(metrics.snapshot()[0][labels], 400)
+        # Folded into the retired shard on the first scrape, still counted after.
+        self.assertEqual(metrics._shards, [])
+        self.assertEqual(metrics.snapshot()[0][labels], 400)
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+SMOKE_TEST = '''
+import sys
+import django
+django.setup()
+from django.test import Client
+client = Client()
+assert client.get('/api/v1/times/date/', {'date': '2026-09-23'}).status_code == 200
+assert client.post('/api/v1/times/batch/', [], content_type='application/json').status_code == 200
+assert 'django.contrib.sessions' not in sys.modules
+assert 'django.contrib.auth.models' not in sys.modules
+'''
+
+
+class TestSettingsProfiles(SimpleTestCase):
+    """Each profile boots in a fresh interpreter and serves the times API."""
+
+    def run_profile(self, module):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': module}
+        result = subprocess.run([sys.executable, '-c', SMOKE_TEST], cwd=settings.BASE_DIR,
+                                env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_api_only(self):
+        self.run_profile('prayer_api.settings_api')
+
+    def test_asgi(self):
+        self.run_profile('prayer_api.settings_asgi')
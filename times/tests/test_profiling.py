@@ -0,0 +1,110 @@
+import json
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from times.middleware import SamplingProfilerMiddleware
+
+URL = '/api/v1/times/date/?date=2026-09-23'
+HEADER = 'HTTP_X_TIMES_PROFILE'
+
+
+class TestSamplingProfiler(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name) / 'profiles'
+        self.settings = override_settings(TIMES_PROFILE_DIR=self.dir, TIMES_PROFILE_KEEP=3)
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+    def test_disabled_by_default(self):
+        response = self.client.get(URL, **{HEADER: ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Times-Profile', response)
+        self.assertFalse(self.dir.exists())
+
+    @override_settings(TIMES_PROFILE_SECRET='s3cret')
+    def test_secret_header(self):
+        response = self.client.get(URL, **{HEADER: 's3cret'})
+        self.assertEqual(response.status_code, 200)
+        profile_id = response['X-Times-Profile']
+        self.assertTrue((self.dir / f'{profile_id}.prof').exists())
+        meta = json.loads((self.dir / f'{profile_id}.json').read_text())
+        self.assertEqual(meta['path'], URL)
+        self.assertEqual((meta['status'], meta['reason']), (200, 'header'))
+
+        response = self.client.get(URL, **{HEADER: 'guess'})
+        self.assertNotIn('X-Times-Profile', response)
+        self.assertEqual(len(list(self.dir.glob('*.prof'))), 1)
+
+    @override_settings(TIMES_PROFILE_RATE=1.0)
+    def test_ring_keeps_newest(self):
+        for day in range(1, 6):
+            self.client.get('/api/v1/times/date/', {'date': f'2026-03-{day:02d}'})
+        kept = sorted(json.loads(p.read_text())['path'] for p in self.dir.glob('*.json'))
+        self.assertEqual(kept, [f'/api/v1/times/date/?date=2026-03-{day:02d}' for day in (3, 4, 5)])
+        self.assertEqual(len(list(self.dir.glob('*.prof'))), 3)
+
+    @override_settings(TIMES_PROFILE_RATE=1.0)
+    def test_concurrent_samples(self):
+        # Both requests are sampled and overlap; only one can be profiled.
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def view(request):
+            both_inside.wait()
+            return HttpResponse('ok')
+
+        middleware = SamplingProfilerMiddleware(view)
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(middleware(RequestFactory().get(URL))))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(len(list(self.dir.glob('*.prof'))), 1)
+        # The lock is free again.
+        both_inside = threading.Barrier(1)
+        middleware(RequestFactory().get(URL))
+        self.assertEqual(len(list(self.dir.glob('*.prof'))), 2)
+
+    @override_settings(TIMES_PROFILE_RATE=1.0)
+    def test_another_profiler_active(self):
+        with mock.patch('cProfile.Profile.enable',
+                        side_effect=ValueError('Another profiling tool is already active')):
+            response = self.client.get(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.dir.exists())
+        self.client.get(URL)
+        self.assertEqual(len(list(self.dir.glob('*.prof'))), 1)
+
+    @override_settings(TIMES_PROFILE_RATE=1.0)
+    def test_command(self):
+        with self.assertRaises(CommandError):
+            call_command('profiles', 'list')
+        self.client.get(URL)
+        self.client.get('/api/v1/times/next/', {'datetime': '2026-09-23T15:45'})
+
+        out = StringIO()
+        call_command('profiles', 'list', stdout=out)
+        self.assertIn('GET /api/v1/times/next/', out.getvalue())
+        self.assertIn('GET ' + URL, out.getvalue())
+
+        out = StringIO()
+        merged = self.dir / 'merged.prof'
+        call_command('profiles', 'aggregate', '--path', '/next/', '--output', str(merged), '--limit', '400', stdout=out)
+        self.assertIn('1 profiles', out.getvalue())
+        self.assertIn('next_prayer', out.getvalue())
+        self.assertTrue(merged.exists())
@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase
+
+from times.utils import get_times_for_day, get_times_for_range
+
+
+class TestRangeEngine(SimpleTestCase):
+
+    def test_matches_per_day_lookup(self):
+        start, end = date(2026, 1, 1), date(2026, 12, 31)
+        rows = get_times_for_range(start, end, 'hanafi', 'colombo')
+        self.assertEqual(len(rows), 365)
+        for i, row in enumerate(rows):
+            d = start + timedelta(days=i)
+            self.assertEqual(row['date'], d.isoformat())
+            self.assertEqual(row['times'], get_times_for_day(d, 'hanafi', 'colombo').times)
+
+    def test_skips_feb_29_row_in_common_year(self):
+        rows = get_times_for_range(date(2026, 2, 28), date(2026, 3, 1), 'shafi', 'colombo')
+        self.assertEqual([r['date'] for r in rows], ['2026-02-28', '2026-03-01'])
+        self.assertEqual(rows[1]['times'], get_times_for_day(date(2026, 3, 1), 'shafi', 'colombo').times)
+
+    def test_out_of_dataset_days_are_error_rows(self):
+        rows = get_times_for_range(date(2025, 12, 30), date(2026, 1, 2), 'shafi', 'others')
+        self.assertEqual(len(rows), 4)
+        self.assertIn('error', rows[0]['times'])
+        self.assertIn('error', rows[1]['times'])
+        self.assertIn('fajr', rows[2]['times'])
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from times.cache import day_body, response_cache
+from times.store import TimetableStore, dataset_reloaded, timetable_store
+from times.timetable import DATA_DIR, dataset_path
+from times.utils import load_table
+
+SEPT_23 = date(2026, 9, 23)
+
+
+class TestReload(SimpleTestCase):
+    """A copy of the 2026 data whose files are edited under a loaded store."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        shutil.copytree(DATA_DIR / '2026', self.data_dir / '2026')
+        self.store = TimetableStore(self.data_dir)
+        self.store.load()
+
+    def maghrib(self, store=None):
+        return (store or self.store).table('shafi', 'colombo', 2026).row(SEPT_23)[4]
+
+    def correct_maghrib(self, minutes):
+        path = dataset_path('shafi', 'colombo', 2026, self.data_dir)
+        raw = load_table('shafi', 'colombo', 2026, self.data_dir)
+        raw[8][22][4] += minutes
+        path.write_text(json.dumps(raw))
+        # Some filesystems keep whole-second mtimes.
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+
+    def test_swaps_in_changed_files(self):
+        before, version = self.maghrib(), self.store.version
+        self.assertFalse(self.store.changed())
+        self.assertFalse(self.store.reload())
+
+        self.correct_maghrib(2)
+        self.assertTrue(self.store.changed())
+        self.assertTrue(self.store.reload())
+        self.assertFalse(self.store.changed())
+        self.assertEqual(self.maghrib(), before + 2)
+        self.assertNotEqual(self.store.version, version)
+        # Resident years were compiled before the swap.
+        self.assertIn(2026, self.store.stats()['resident_years'])
+        self.assertEqual(self.store.stats()['reloads'], 1)
+
+    def test_pinned_requests_keep_their_snapshot(self):
+        before, version = self.maghrib(), self.store.version
+        with self.store.pinned():
+            self.correct_maghrib(2)
+            self.store.reload()
+            self.assertEqual(self.maghrib(), before)
+            self.assertEqual(self.store.version, version)
+        self.assertEqual(self.maghrib(), before + 2)
+
+    def test_broken_files_keep_the_old_snapshot(self):
+        version = self.store.version
+        dataset_path('shafi', 'colombo', 2026, self.data_dir).write_text('[[')
+        with self.assertRaises(ValueError):
+            self.store.reload()
+        self.assertEqual(self.store.version, version)
+        self.assertEqual(self.store.table('shafi', 'colombo', 2026).year, 2026)
+
+    def test_incomplete_year_keeps_the_old_snapshot(self):
+        version = self.store.version
+        (self.data_dir / '2027').mkdir()
+        shutil.copy(dataset_path('shafi', 'colombo', 2026, self.data_dir), self.data_dir / '2027')
+        with self.assertRaises(ValueError):
+            self.store.reload()
+        self.assertEqual(self.store.version, version)
+        self.assertTrue(self.store.changed())
+
+    def test_signal(self):
+        received = []
+
+        def receiver(sender, version, **kwargs):
+            received.append(version)
+
+        dataset_reloaded.connect(receiver, sender=self.store)
+        self.addCleanup(dataset_reloaded.disconnect, receiver, sender=self.store)
+        self.correct_maghrib(1)
+        self.store.reload()
+        self.assertEqual(received, [self.store.version])
+
+
+class TestDerivedCaches(SimpleTestCase):
+
+    @override_settings(TIMES_BULK_PRERENDER=False)
+    def test_reload_clears_rendered_bodies(self):
+        day_body(SEPT_23, 'shafi', 'colombo')
+        self.assertGreater(len(response_cache), 0)
+        dataset_reloaded.send(sender=timetable_store, version=timetable_store.version)
+        self.assertEqual(len(response_cache), 0)
+
+    def test_streamed_ranges_keep_their_snapshot(self):
+        response = self.client.get('/api/v1/times/range/', {
+            'start': '2026-01-01', 'end': '2026-12-31', 'format': 'ndjson',
+        })
+        snapshot = timetable_store.current()
+        # Another version swapped in before the body is read.
+        timetable_store._snapshot = TimetableStore(use_compiled=False).current()
+        self.addCleanup(setattr, timetable_store, '_snapshot', snapshot)
+        timetable_store._snapshot.available.clear()
+        rows = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(len(rows), 365)
+        self.assertNotIn(b'error', rows[0])
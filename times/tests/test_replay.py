@@ -0,0 +1,50 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from benchmarks import replay
+
+TRAFFIC = [
+    {'ts': 100.0, 'path': '/api/v1/times/today/', 'query': 'madhab=hanafi'},
+    {'ts': 100.5, 'method': 'POST', 'path': '/api/v1/times/batch/',
+     'body': [{'type': 'date', 'date': '2026-09-23'}]},
+    {'ts': 100.2, 'path': '/api/v1/times/date/', 'query': 'date=2026-09-23'},
+    {'ts': 100.3, 'path': '/api/v1/times/date/', 'query': 'date=2100-01-01'},
+]
+LINES = [json.dumps(item) for item in TRAFFIC]
+
+
+class TestTrafficFormat(SimpleTestCase):
+
+    def test_read_traffic_sorts_by_timestamp(self):
+        records = replay.read_traffic(LINES + [''])
+        self.assertEqual([r.ts for r in records], [100.0, 100.2, 100.3, 100.5])
+        self.assertEqual(records[0].target, '/api/v1/times/today/?madhab=hanafi')
+        self.assertEqual(records[3].method, 'POST')
+        self.assertEqual(json.loads(records[3].body), TRAFFIC[1]['body'])
+
+    def test_read_traffic_reports_bad_lines(self):
+        with self.assertRaisesMessage(ValueError, 'line 2'):
+            replay.read_traffic([LINES[0], '{"path": "/api/v1/times/today/"}'])
+
+    def test_schedule(self):
+        records = replay.read_traffic(LINES)
+        self.assertEqual([round(o, 6) for o in replay.schedule(records, speed=2)], [0, 0.1, 0.15, 0.25])
+        self.assertEqual(replay.schedule(records, rps=4), [0, 0.25, 0.5, 0.75])
+
+
+class TestReplay(LiveServerTestCase):
+
+    def test_reports_per_endpoint(self):
+        report = replay.replay(self.live_server_url, replay.read_traffic(LINES), speed=10, concurrency=2)
+        endpoints = report['endpoints']
+        self.assertEqual(endpoints['all']['requests'], 4)
+        self.assertEqual(endpoints['/api/v1/times/date/']['requests'], 2)
+        self.assertEqual(endpoints['/api/v1/times/date/']['error_rate'], 0.5)  # 2100 is a 404
+        self.assertEqual(endpoints['/api/v1/times/batch/']['error_rate'], 0.0)
+
+    def test_command_rejects_empty_file(self):
+        with self.assertRaisesMessage(CommandError, 'has no requests'):
+            call_command('replay_traffic', '/dev/null', '--url', self.live_server_url, stdout=StringIO())
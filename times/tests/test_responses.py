@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from times.serializers import PrayerEventSerializer, PrayerTimesRangeSerializer, PrayerTimesSerializer
+from times.utils import get_times_for_day, get_times_for_range
+
+
+class TestFastJSONPath(SimpleTestCase):
+    """The times views must keep emitting exactly what the serializers did."""
+
+    def render(self, serializer):
+        return JSONRenderer().render(serializer.data)
+
+    def test_date_bytes(self):
+        pt = get_times_for_day(date(2026, 9, 23), 'shafi', 'colombo')
+        response = self.client.get('/api/v1/times/date/', {
+            'madhab': 'shafi', 'city': 'colombo', 'date': '2026-09-23',
+        })
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, self.render(PrayerTimesSerializer(pt)))
+
+    def test_range_bytes(self):
+        start, end = date(2025, 12, 30), date(2026, 1, 3)
+        response = self.client.get('/api/v1/times/range/', {
+            'madhab': 'hanafi', 'city': 'others', 'start': str(start), 'end': str(end),
+        })
+        expected = self.render(PrayerTimesRangeSerializer({
+            'start': start, 'end': end, 'madhab': 'hanafi', 'city': 'others',
+            'results': get_times_for_range(start, end, 'hanafi', 'others'),
+        }))
+        self.assertEqual(response.content, expected)
+
+    def test_next_bytes(self):
+        response = self.client.get('/api/v1/times/next/', {
+            'madhab': 'shafi', 'city': 'colombo', 'datetime': '2026-09-23T12:00',
+        })
+        self.assertEqual(response.content, self.render(PrayerEventSerializer(response.json())))
@@ -0,0 +1,58 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.test import APIRequestFactory
+
+from prayer_api.urls import schema_patterns
+from times.schema import CachedSpectacularAPIView, schema_path
+
+URL = '/api/v1/schema/'
+
+
+class TestCachedSchema(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch('times.schema.SCHEMA_DIR', Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        CachedSpectacularAPIView.clear_cache()
+        self.addCleanup(CachedSpectacularAPIView.clear_cache)
+
+    def test_same_body_as_spectacular(self):
+        view = SpectacularAPIView.as_view(patterns=schema_patterns)
+        for suffix in ('yaml', 'json'):
+            expected = view(APIRequestFactory().get(URL, {'format': suffix})).render()
+            response = self.client.get(URL, {'format': suffix})
+            self.assertEqual(response.content, expected.content)
+            self.assertEqual(response['Content-Type'], expected['Content-Type'])
+
+    def test_generated_once_with_etag(self):
+        with mock.patch.object(CachedSpectacularAPIView, 'render_schema', autospec=True,
+                               side_effect=CachedSpectacularAPIView.render_schema) as render:
+            first = self.client.get(URL)
+            second = self.client.get(URL, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+
+    def test_serves_file_built_for_current_code_version(self):
+        call_command('build_openapi_schema', stdout=mock.Mock())
+        CachedSpectacularAPIView.clear_cache()
+        path = schema_path('v1', 'yaml')
+        path.write_bytes(b'openapi: 3.0.3\n')
+        with mock.patch.object(CachedSpectacularAPIView, 'render_schema') as render:
+            response = self.client.get(URL)
+        render.assert_not_called()
+        self.assertEqual(response.content, b'openapi: 3.0.3\n')
+
+    def test_files_from_other_code_versions_are_ignored(self):
+        path = schema_path('v1', 'yaml')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.with_name('openapi-v1-0000000000000000.yaml').write_bytes(b'stale')
+        self.assertNotEqual(self.client.get(URL).content, b'stale')
@@ -0,0 +1,117 @@
+import json
+import shutil
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from times import store as store_module
+from times.store import TimetableStore, timetable_store
+from times.timetable import (
+    COLUMNS, DATA_DIR, DAYS_PER_TABLE, LANKA_TZ, MISSING, compile_table, dataset_path,
+)
+from times.utils import (
+    compute_midnight, compute_tahajjud, load_table, minutes_to_hhmm, previous_prayer,
+    upcoming_prayers,
+)
+
+
+class TestTimetableStore(SimpleTestCase):
+
+    def test_loaded_at_startup(self):
+        self.assertTrue(timetable_store.loaded)
+
+    def test_table_matches_json(self):
+        table = timetable_store.table('shafi', 'colombo', 2026)
+        raw = load_table('shafi', 'colombo', 2026)
+        self.assertEqual(list(table.row(date(2026, 9, 23))[:6]), raw[8][22])
+        self.assertEqual(len(table.data), DAYS_PER_TABLE * len(COLUMNS))
+
+    def test_derived_columns_match_string_helpers(self):
+        raw = load_table('shafi', 'colombo', 2026)
+        row = compile_table(raw, 2026)[(31 + 29) * 8:(31 + 29) * 8 + 8]  # Mar 1
+        maghrib, next_fajr = minutes_to_hhmm(raw[2][0][4]), minutes_to_hhmm(raw[2][1][0])
+        self.assertEqual(minutes_to_hhmm(row[6]), compute_tahajjud(maghrib, next_fajr))
+        self.assertEqual(minutes_to_hhmm(row[7]), compute_midnight(maghrib, next_fajr))
+
+    def test_year_end_night_wraps_to_jan_first(self):
+        raw = load_table('shafi', 'colombo', 2026)
+        row = timetable_store.table('shafi', 'colombo', 2026).row(date(2026, 12, 31))
+        self.assertNotEqual(row[6], MISSING)
+        expected = compute_tahajjud(minutes_to_hhmm(raw[11][30][4]), minutes_to_hhmm(raw[0][0][0]))
+        self.assertEqual(minutes_to_hhmm(row[6]), expected)
+
+    def test_requests_do_not_touch_disk(self):
+        with mock.patch.object(store_module, 'load_table', side_effect=AssertionError('disk read')):
+            response = self.client.get('/api/v1/times/range/', {
+                'madhab': 'hanafi', 'city': 'others',
+                'start': '2026-01-01', 'end': '2026-12-31',
+            })
+        self.assertEqual(response.status_code, 200)
+
+    def test_perennial_years(self):
+        store = TimetableStore(perennial=True)
+        next_year = datetime.now(LANKA_TZ).year + 1
+        self.assertTrue(store.has_year(next_year))
+        self.assertEqual(store.years[-1], next_year)
+        self.assertFalse(store.has_year(next_year + 1))
+        self.assertFalse(store.has_year(2025))
+        self.assertEqual(store.table('shafi', 'colombo', next_year).year, next_year)
+        self.assertFalse(TimetableStore().has_year(next_year))
+
+    def test_lazy_load_and_stats(self):
+        store = TimetableStore()
+        self.assertFalse(store.loaded)
+        store.table('hanafi', 'colombo', 2026)
+        stats = store.stats()
+        self.assertTrue(stats['loaded'])
+        self.assertIn('2026/hanafi.colombo', stats['datasets'])
+        self.assertGreater(stats['memory_bytes'], 0)
+
+
+class TestMultiYear(SimpleTestCase):
+    """A data directory holding 2026 and a copy of it as 2027."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        shutil.copytree(DATA_DIR / '2026', self.data_dir / '2026')
+        shutil.copytree(DATA_DIR / '2026', self.data_dir / '2027')
+        (self.data_dir / '2028').mkdir()  # empty year directories are ignored
+        self.store = TimetableStore(self.data_dir, max_years=1)
+
+    def test_years_load_lazily_with_lru_eviction(self):
+        with mock.patch('times.store.datetime') as fake_now:
+            fake_now.now.return_value = datetime(2030, 1, 1)
+            self.store.load()
+        self.assertEqual(self.store.years, [2026, 2027])
+        self.assertFalse(self.store.has_year(2028))
+        self.assertEqual(self.store.stats()['resident_years'], [])
+        self.store.table('shafi', 'colombo', 2026)
+        self.store.table('shafi', 'colombo', 2027)
+        self.assertEqual(self.store.stats()['resident_years'], [2027])
+
+    def test_incomplete_year_fails_loudly(self):
+        shutil.copy(dataset_path('shafi', 'colombo', 2026, self.data_dir), self.data_dir / '2028')
+        with self.assertRaisesRegex(ValueError, '2028 is incomplete: missing hanafi.colombo.json'):
+            self.store.load()
+
+    def test_dec_31_uses_next_years_fajr(self):
+        raw_2027 = load_table('shafi', 'colombo', 2027, self.data_dir)
+        raw_2027[0][0][0] -= 30
+        dataset_path('shafi', 'colombo', 2027, self.data_dir).write_text(json.dumps(raw_2027))
+        store = TimetableStore(self.data_dir)
+        row = store.table('shafi', 'colombo', 2026).row(date(2026, 12, 31))
+        expected = compute_tahajjud(minutes_to_hhmm(row[4]), minutes_to_hhmm(raw_2027[0][0][0]))
+        self.assertEqual(minutes_to_hhmm(row[6]), expected)
+
+    def test_next_prayer_crosses_into_next_year(self):
+        with mock.patch('times.utils.timetable_store', self.store):
+            events = upcoming_prayers(datetime(2026, 12, 31, 23, 0), 'shafi', 'colombo', 4)
+            previous = previous_prayer(datetime(2027, 1, 1, 0, 30), 'shafi', 'colombo')
+        self.assertEqual([e.name for e in events], ['midnight', 'tahajjud', 'fajr', 'sunrise'])
+        self.assertEqual(events[2].time.date(), date(2027, 1, 1))
+        self.assertEqual((previous.name, previous.time.date()), ('midnight', date(2026, 12, 31)))
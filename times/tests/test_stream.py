@@ -0,0 +1,47 @@
+import json
+from datetime import date
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times.utils import get_times_for_range, iter_times_for_range
+
+PARAMS = {'madhab': 'shafi', 'city': 'colombo', 'start': '2025-12-30', 'end': '2026-03-02'}
+
+
+class TestRangeStreaming(SimpleTestCase):
+
+    def test_ndjson_matches_json_results(self):
+        response = self.client.get('/api/v1/times/range/', {**PARAMS, 'format': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).splitlines()
+        expected = self.client.get('/api/v1/times/range/', PARAMS).json()['results']
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_accept_header_selects_ndjson(self):
+        response = self.client.get('/api/v1/times/range/', PARAMS, HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(response.streaming)
+
+    def test_max_span(self):
+        with mock.patch('times.views.RANGE_STREAM_MAX_DAYS', 10):
+            response = self.client.get('/api/v1/times/range/', {**PARAMS, 'format': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', json.loads(response.content))
+
+    def test_chunks_cover_range(self):
+        start, end = date(2026, 1, 1), date(2026, 3, 5)
+        chunks = list(iter_times_for_range(start, end, 'hanafi', 'others', 31))
+        self.assertEqual([len(c) for c in chunks], [31, 31, 2])
+        self.assertEqual(sum(chunks, []), get_times_for_range(start, end, 'hanafi', 'others'))
+
+    def test_range_ending_at_the_end_of_the_calendar(self):
+        params = {**PARAMS, 'start': '9999-12-20', 'end': '9999-12-31'}
+        response = self.client.get('/api/v1/times/range/', {**params, 'format': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(lines), 12)
+        self.assertEqual(lines[-1]['date'], '9999-12-31')
+        self.assertEqual(lines, self.client.get('/api/v1/times/range/', params).json()['results'])
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times.store import TimetableStore, timetable_store
+from times.utils import (
+    LANKA_TZ, PrayerDataNotAvailable, get_times_for_day, next_prayer, previous_prayer, upcoming_prayers,
+)
+
+
+class TestTimeline(SimpleTestCase):
+
+    def test_timeline_is_sorted(self):
+        epochs = timetable_store.timeline('shafi', 'colombo', 2026).epochs
+        self.assertEqual(list(epochs), sorted(epochs))
+        self.assertEqual(len(epochs), 365 * 8)
+
+    def test_next_prayer_same_day(self):
+        times = get_times_for_day(datetime(2026, 9, 23).date(), 'shafi', 'colombo')
+        event = next_prayer(datetime(2026, 9, 23, 12, 0), 'shafi', 'colombo')
+        self.assertEqual(event.name, 'dhuhr')
+        self.assertEqual(event.time.strftime('%H:%M'), times.dhuhr)
+
+    def test_next_prayer_crosses_midnight(self):
+        times = get_times_for_day(datetime(2026, 9, 24).date(), 'shafi', 'colombo')
+        events = upcoming_prayers(datetime(2026, 9, 23, 22, 0), 'shafi', 'colombo', 3)
+        self.assertEqual([e.name for e in events], ['midnight', 'tahajjud', 'fajr'])
+        self.assertEqual(events[2].time.date().isoformat(), '2026-09-24')
+        self.assertEqual(events[2].time.strftime('%H:%M'), times.fajr)
+
+    def test_next_prayer_crosses_month(self):
+        events = upcoming_prayers(datetime(2026, 1, 31, 20, 0), 'hanafi', 'others', 8)
+        self.assertEqual(events[-1].time.month, 2)
+
+    def test_previous_prayer(self):
+        times = get_times_for_day(datetime(2026, 9, 23).date(), 'shafi', 'colombo')
+        event = previous_prayer(datetime(2026, 9, 23, 12, 0), 'shafi', 'colombo')
+        self.assertEqual(event.name, 'sunrise')
+        self.assertEqual(event.time.strftime('%H:%M'), times.sunrise)
+
+    def test_aware_datetime_is_converted(self):
+        utc = LANKA_TZ.localize(datetime(2026, 9, 23, 12, 0)).astimezone(timezone.utc)
+        self.assertEqual(next_prayer(utc, 'shafi', 'colombo').name, 'dhuhr')
+
+    def test_end_of_data(self):
+        store = TimetableStore()  # no perennial years
+        with mock.patch('times.utils.timetable_store', store):
+            events = upcoming_prayers(datetime(2026, 12, 31, 23, 59), 'shafi', 'colombo', 5)
+            self.assertEqual([e.name for e in events], ['tahajjud'])
+            self.assertEqual(store.timeline('shafi', 'colombo', 2026).after(events[0].time.timestamp()), [])
+
+            # Early on Jan 1 the Dec 31 night still answers, though the year has no data.
+            after_midnight = datetime(2027, 1, 1, 0, 10)
+            self.assertEqual(next_prayer(after_midnight, 'shafi', 'colombo').name, 'tahajjud')
+            self.assertEqual(previous_prayer(after_midnight, 'shafi', 'colombo').time.date().year, 2026)
+            with self.assertRaises(PrayerDataNotAvailable):
+                next_prayer(datetime(2027, 6, 1), 'shafi', 'colombo')
+
+    def test_perennial_next_year(self):
+        events = upcoming_prayers(datetime(2026, 12, 31, 23, 59), 'shafi', 'colombo', 3)
+        self.assertEqual([e.name for e in events], ['tahajjud', 'fajr', 'sunrise'])
+        fajr = get_times_for_day(datetime(2026, 1, 1).date(), 'shafi', 'colombo').fajr
+        self.assertEqual(events[1].time.strftime('%Y-%m-%d %H:%M'), f'2027-01-01 {fajr}')
+
+
+class TestNextEndpoint(SimpleTestCase):
+
+    def test_after_isha_returns_tomorrow(self):
+        response = self.client.get('/api/v1/times/next/', {
+            'madhab': 'shafi', 'city': 'colombo', 'datetime': '2026-09-23T23:59',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['next_prayer']['name'], 'tahajjud')
+        self.assertEqual(response.json()['next_prayer']['date'], '2026-09-24')
+
+    def test_ends_of_the_calendar_are_not_available(self):
+        for url in ('/api/v1/times/next/', '/api/v1/times/upcoming/'):
+            for value in ('9999-12-31T23:00', '0001-01-01T00:00'):
+                with self.subTest(url=url, datetime=value):
+                    response = self.client.get(url, {'datetime': value})
+                    self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post('/api/v1/times/batch/', [{'type': 'next', 'datetime': '9999-12-31T23:00'}],
+                                    content_type='application/json')
+        self.assertEqual(response.json()['results'][0]['status'], status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase, override_settings
+
+from times import timing
+from times.store import timetable_store
+
+RANGE = '/api/v1/times/range/?start=2026-01-01&end=2026-12-31'
+
+
+def parse(header):
+    stages = {}
+    for metric in header.split(', '):
+        name, dur = metric.split(';dur=')
+        stages[name] = float(dur)
+    return stages
+
+
+class TestServerTiming(SimpleTestCase):
+
+    def test_disabled_by_default(self):
+        response = self.client.get(RANGE)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(TIMES_SERVER_TIMING=True)
+    def test_range_stages(self):
+        response = self.client.get(RANGE)
+        self.assertEqual(response.status_code, 200)
+        stages = parse(response['Server-Timing'])
+        # "load" only appears for requests that compile a dataset year.
+        self.assertEqual([s for s in stages if s != 'load'], ['validate', 'lookup', 'render', 'total'])
+        self.assertGreaterEqual(stages['total'], stages['lookup'])
+
+    @override_settings(TIMES_SERVER_TIMING=True)
+    def test_load_reported_when_a_year_is_compiled(self):
+        timetable_store.current().resident.pop(2026, None)
+        stages = parse(self.client.get(RANGE)['Server-Timing'])
+        self.assertIn('load', stages)
+        self.assertNotIn('load', parse(self.client.get(RANGE)['Server-Timing']))
+
+    @override_settings(TIMES_SERVER_TIMING=True)
+    def test_errors_and_streams_carry_the_header(self):
+        response = self.client.get('/api/v1/times/range/', {'madhab': 'maliki'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(parse(response['Server-Timing'])), ['validate', 'total'])
+        response = self.client.get(RANGE + '&format=ndjson')
+        self.assertIn('validate', parse(response['Server-Timing']))
+        b''.join(response.streaming_content)
+
+    @override_settings(TIMES_TIMING_LOG=True)
+    def test_log(self):
+        with self.assertLogs('times.timing', 'INFO') as logs:
+            response = self.client.get(RANGE)
+        self.assertNotIn('Server-Timing', response)
+        record = logs.records[0]
+        self.assertEqual((record.method, record.path, record.status), ('GET', '/api/v1/times/range/', 200))
+        self.assertIn('lookup', record.timings_ms)
+        self.assertIn('status=200 validate_ms=', record.getMessage())
+
+
+class TestTimed(SimpleTestCase):
+
+    def test_nested_calls_to_a_stage_count_once(self):
+        @timing.timed('lookup')
+        def inner():
+            return 1
+
+        @timing.timed('lookup')
+        def outer():
+            return inner() + 1
+
+        self.assertEqual(outer(), 2)  # no request: just calls through
+        timings = timing.start()
+        try:
+            outer()
+        finally:
+            timing.stop()
+        self.assertEqual(list(timings.seconds), ['lookup'])
+        self.assertEqual(timings._open, set())
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from times.store import TimetableStore
+from times.utils import LANKA_TZ, get_times_for_day, upcoming_prayers, upcoming_prayers_within
+
+URL = '/api/v1/times/upcoming/'
+
+
+class TestUpcomingEndpoint(SimpleTestCase):
+
+    def get(self, **params):
+        return self.client.get(URL, {'madhab': 'shafi', 'city': 'colombo', **params})
+
+    def test_count_spans_midnight(self):
+        response = self.get(datetime='2026-09-23T20:00', count=4)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body['given_datetime'], '2026-09-23T20:00:00')
+        self.assertEqual([e['name'] for e in body['events']], ['midnight', 'tahajjud', 'fajr', 'sunrise'])
+        tomorrow = get_times_for_day(date(2026, 9, 24), 'shafi', 'colombo')
+        self.assertEqual(body['events'][2], {'name': 'fajr', 'date': '2026-09-24', 'time': tomorrow.fajr})
+        # The first event is what /next/ answers.
+        next_prayer = self.client.get('/api/v1/times/next/', {'datetime': '2026-09-23T20:00'}).json()
+        self.assertEqual(body['events'][0], next_prayer['next_prayer'])
+
+    def test_default_count_is_a_day(self):
+        events = self.get(datetime='2026-01-31T20:00').json()['events']
+        self.assertEqual(len(events), 8)
+        self.assertEqual(events[-1]['date'], '2026-02-01')
+
+    def test_hours_window(self):
+        events = self.get(datetime='2026-09-23T20:00', hours=24).json()['events']
+        self.assertEqual(len(events), 8)
+        self.assertEqual([e['name'] for e in events[:2]], ['midnight', 'tahajjud'])
+        self.assertEqual(events[-1]['name'], 'isha')
+        self.assertEqual(self.get(datetime='2026-09-23T20:00', hours=0.01).json()['events'], [])
+
+    def test_end_of_data(self):
+        with mock.patch('times.utils.timetable_store', TimetableStore()):  # no perennial years
+            events = self.get(datetime='2026-12-31T23:59', count=5).json()['events']
+        self.assertEqual([e['name'] for e in events], ['tahajjud'])
+        self.assertEqual(self.get(datetime='2100-01-01T00:00').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_params(self):
+        for params in (
+            {},
+            {'datetime': 'tonight'},
+            {'datetime': '2026-09-23T20:00', 'count': 0},
+            {'datetime': '2026-09-23T20:00', 'count': 'many'},
+            {'datetime': '2026-09-23T20:00', 'count': 1000},
+            {'datetime': '2026-09-23T20:00', 'hours': -1},
+            {'datetime': '2026-09-23T20:00', 'hours': 'nan'},
+            {'datetime': '2026-09-23T20:00', 'count': 3, 'hours': 3},
+            {'datetime': '2026-09-23T20:00', 'madhab': 'maliki'},
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('error', response.json())
+
+
+class TestUpcomingWithin(SimpleTestCase):
+
+    def test_matches_upcoming_prayers_cut_at_the_window(self):
+        start = datetime(2026, 1, 30, 20, 0)
+        within = upcoming_prayers_within(start, 'hanafi', 'others', 48)
+        until = LANKA_TZ.localize(datetime(2026, 2, 1, 20, 0))
+        expected = [e for e in upcoming_prayers(start, 'hanafi', 'others', 40) if e.time <= until]
+        self.assertEqual([(e.name, e.time) for e in within], [(e.name, e.time) for e in expected])
+        self.assertEqual(within[-1].time.month, 2)
@@ -0,0 +1,86 @@
+import calendar
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple
+
+from .timetable import COLUMNS, FAJR, LANKA_TZ, MAGHRIB, MIDNIGHT, MISSING, TAHAJJUD, Timetable
+
+
+class TimelineEvent(NamedTuple):
+    epoch: int
+    name: str
+
+    @property
+    def time(self) -> datetime:
+        """The event as an aware Asia/Colombo datetime."""
+        return datetime.fromtimestamp(self.epoch, LANKA_TZ)
+
+
+class Timeline:
+    """
+    Every event of a timetable as sorted UTC epoch seconds.
+
+    Lookups are a single bisect, so they run straight across midnight,
+    month and year boundaries within the data.
+    """
+
+    __slots__ = ('madhab', 'city', 'epochs', 'kinds')
+
+    def __init__(self, madhab: str, city: str, epochs: array, kinds: array):
+        self.madhab = madhab
+        self.city = city
+        self.epochs = epochs
+        self.kinds = kinds
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.epochs) + sys.getsizeof(self.kinds)
+
+    def _event(self, i: int) -> TimelineEvent:
+        return TimelineEvent(self.epochs[i], COLUMNS[self.kinds[i]])
+
+    def after(self, epoch: float, count: int = 1) -> List[TimelineEvent]:
+        """Up to ``count`` events strictly after ``epoch``, earliest first."""
+        start = bisect_right(self.epochs, epoch)
+        return [self._event(i) for i in range(start, min(start + count, len(self.epochs)))]
+
+    def before(self, epoch: float, count: int = 1) -> List[TimelineEvent]:
+        """Up to ``count`` events strictly before ``epoch``, latest first."""
+        end = bisect_left(self.epochs, epoch)
+        return [self._event(i) for i in range(end - 1, max(end - count, 0) - 1, -1)]
+
+
+def local_midnight_epoch(d: date) -> int:
+    """UTC epoch seconds of 00:00 Asia/Colombo on ``d``."""
+    offset = LANKA_TZ.utcoffset(datetime(d.year, d.month, d.day))
+    return calendar.timegm(d.timetuple()) - int(offset.total_seconds())
+
+
+def build_timeline(table: Timetable) -> Timeline:
+    events = []
+    d = date(table.year, 1, 1)
+    while d.year == table.year:
+        row = table.row(d)
+        if row[FAJR] != MISSING:
+            midnight = local_midnight_epoch(d)
+            for kind, minutes in enumerate(row):
+                if minutes == MISSING:
+                    continue
+                # The night columns fall after Maghrib, possibly past 00:00.
+                if kind in (TAHAJJUD, MIDNIGHT) and minutes < row[MAGHRIB]:
+                    minutes += 24 * 60
+                events.append((midnight + minutes * 60, kind))
+        d += timedelta(days=1)
+
+    events.sort()
+    return Timeline(
+        table.madhab,
+        table.city,
+        array('q', (epoch for epoch, _ in events)),
+        array('B', (kind for _, kind in events)),
+    )
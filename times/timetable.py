@@ -0,0 +1,117 @@
+import json
+import sys
+from array import array
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pytz
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # project root
+# One directory per year: data_lk/<year>/<madhab>.<city>.json
+DATA_DIR = BASE_DIR / 'prayer_api' / 'data_lk'
+
+LANKA_TZ = pytz.timezone('Asia/Colombo')
+
+# Columns of a compiled timetable, in minutes after midnight (Asia/Colombo).
+# tahajjud and midnight belong to the night that starts at that day's Maghrib.
+COLUMNS = ('fajr', 'sunrise', 'dhuhr', 'asr', 'maghrib', 'isha', 'tahajjud', 'midnight')
+N_COLUMNS = len(COLUMNS)
+FAJR, SUNRISE, DHUHR, ASR, MAGHRIB, ISHA, TAHAJJUD, MIDNIGHT = range(N_COLUMNS)
+
+# The ACJU tables are perennial: one row per day of a leap year, Feb 29 included.
+DAYS_PER_TABLE = 366
+MONTH_LENGTHS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_OFFSETS = tuple(sum(MONTH_LENGTHS[:m]) for m in range(12))
+
+# Marks a row the source dataset does not provide (e.g. a 28-day February).
+MISSING = 0xFFFF
+
+
+def dataset_path(madhab: str, city: str, year: int, data_dir: Path = DATA_DIR) -> Path:
+    return data_dir / str(year) / f"{madhab}.{city}.json"
+
+
+def load_table(madhab: str, city: str, year: int, data_dir: Path = DATA_DIR) -> List[List[List[int]]]:
+    """Read one dataset straight from disk. Prefer ``timetable_store.table()``."""
+    file_path = dataset_path(madhab, city, year, data_dir)
+    with open(file_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def day_index(d: date) -> int:
+    """Row of ``d`` in a compiled timetable."""
+    return _MONTH_OFFSETS[d.month - 1] + d.day - 1
+
+
+def night_point(maghrib: int, next_fajr: int, numerator: int, denominator: int) -> int:
+    """
+    Clock time (minutes) that is numerator/denominator of the night before
+    the next Fajr, the night running from Maghrib to the next day's Fajr.
+    """
+    fajr_next = 24 * 60 + next_fajr
+    night = fajr_next - maghrib
+    return (fajr_next - (night * numerator) // denominator) % (24 * 60)
+
+
+def compile_table(raw: List[List[List[int]]], year: int, next_year_fajr: Optional[int] = None) -> array:
+    """
+    Flatten a month/day JSON table into a ``DAYS_PER_TABLE x N_COLUMNS``
+    uint16 matrix and fill in the tahajjud and midnight columns.
+
+    The night after Dec 31 ends at the next year's Jan 1 Fajr. Without that
+    dataset, the table is treated as perennial and its own first row is used.
+    """
+    if len(raw) != 12:
+        raise ValueError(f'Expected 12 months, got {len(raw)}')
+
+    data = array('H', [MISSING]) * (DAYS_PER_TABLE * N_COLUMNS)
+    for m, month in enumerate(raw):
+        if len(month) > MONTH_LENGTHS[m]:
+            raise ValueError(f'Month {m + 1} has {len(month)} days')
+        for i, times in enumerate(month):
+            if len(times) != ISHA + 1:
+                raise ValueError(f'Month {m + 1} day {i + 1} has {len(times)} times')
+            base = (_MONTH_OFFSETS[m] + i) * N_COLUMNS
+            data[base:base + ISHA + 1] = array('H', times)
+
+    d = date(year, 1, 1)
+    while d.year == year:
+        following = d + timedelta(days=1)
+        row = day_index(d) * N_COLUMNS
+        maghrib = data[row + MAGHRIB]
+        if following.year == year:
+            next_fajr = data[day_index(following) * N_COLUMNS + FAJR]
+        else:
+            next_fajr = next_year_fajr if next_year_fajr is not None else data[FAJR]
+        if maghrib != MISSING and next_fajr != MISSING:
+            data[row + TAHAJJUD] = night_point(maghrib, next_fajr, 1, 3)
+            data[row + MIDNIGHT] = night_point(maghrib, next_fajr, 1, 2)
+        d = following
+    return data
+
+
+class Timetable:
+    """
+    One madhab/city dataset compiled for a given year. ``data`` is either an
+    in-process array or a view into the mmapped compiled file.
+    """
+
+    __slots__ = ('madhab', 'city', 'year', 'data')
+
+    def __init__(self, madhab: str, city: str, year: int, data: Union[array, memoryview]):
+        self.madhab = madhab
+        self.city = city
+        self.year = year
+        self.data = data
+
+    def row(self, d: date) -> Union[array, memoryview]:
+        """All ``COLUMNS`` for ``d``; entries may be ``MISSING``."""
+        base = day_index(d) * N_COLUMNS
+        return self.data[base:base + N_COLUMNS]
+
+    @property
+    def nbytes(self) -> int:
+        if isinstance(self.data, memoryview):
+            return self.data.nbytes  # page cache, shared between processes
+        return sys.getsizeof(self.data)
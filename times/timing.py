@@ -0,0 +1,78 @@
+"""
+Per-stage timing of the lookup hot path, reported by
+``times.middleware.ServerTimingMiddleware``.
+
+Functions marked with ``@timed(stage)`` add their wall time to the current
+request's ``Timings``. Outside an instrumented request (the middleware is
+disabled, or a streaming body is being sent after the view returned) a
+marked call costs one context variable lookup.
+"""
+import functools
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Optional
+
+logger = logging.getLogger('times.timing')
+
+# Stage names, in the order they are reported.
+STAGES = ('validate', 'load', 'lookup', 'render')
+
+
+class Timings:
+    """Accumulated seconds per stage for one request."""
+
+    __slots__ = ('seconds', '_open')
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        # Stages being timed right now, so a nested call to the same stage
+        # (e.g. a lookup that falls back to another) is not counted twice.
+        self._open = set()
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def milliseconds(self) -> Dict[str, float]:
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return {
+            stage: round(self.seconds[stage] * 1000, 3)
+            for stage in sorted(self.seconds, key=lambda s: order.get(s, len(STAGES)))
+        }
+
+    def server_timing(self) -> str:
+        """The ``Server-Timing`` header value, e.g. ``validate;dur=0.012, lookup;dur=1.3``."""
+        return ', '.join(f'{stage};dur={ms}' for stage, ms in self.milliseconds().items())
+
+
+_current: ContextVar[Optional[Timings]] = ContextVar('times_timings', default=None)
+
+
+def start() -> Timings:
+    """Begin collecting stage timings for the request running in this context."""
+    timings = Timings()
+    _current.set(timings)
+    return timings
+
+
+def stop() -> None:
+    _current.set(None)
+
+
+def timed(stage: str):
+    """Decorator adding each call's duration to ``stage`` of the current request."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None or stage in timings._open:
+                return fn(*args, **kwargs)
+            timings._open.add(stage)
+            started = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings.add(stage, perf_counter() - started)
+                timings._open.discard(stage)
+        return wrapper
+    return decorator
@@ -1,9 +1,34 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
-urlpatterns = [
+sync_urlpatterns = [
     path('times/today/', views.today_times),
     path('times/date/', views.date_times),
     path('times/next/', views.next_times),
+    path('times/upcoming/', views.upcoming_times),
+    path('times/events/', views.events_times),
     path('times/range/', views.range_times),
-]
\ No newline at end of file
+    path('times/matrix/', views.matrix_times),
+    path('times/year/', views.year_times),
+    path('times/month/', views.month_times),
+    path('times/calendar.ics', views.calendar_times),
+    path('times/batch/', views.batch_times),
+]
+
+async_urlpatterns = [
+    path('times/today/', views.today_times_async),
+    path('times/date/', views.date_times_async),
+    path('times/next/', views.next_times_async),
+    path('times/upcoming/', views.upcoming_times_async),
+    path('times/events/', views.events_times_async),
+    path('times/range/', views.range_times_async),
+    path('times/matrix/', views.matrix_times_async),
+    path('times/year/', views.year_times_async),
+    path('times/month/', views.month_times_async),
+    path('times/calendar.ics', views.calendar_times_async),
+    path('times/batch/', views.batch_times_async),
+]
+
+# The OpenAPI schema is always generated from the DRF views (see prayer_api/urls.py).
+urlpatterns = async_urlpatterns if getattr(settings, 'TIMES_ASYNC_VIEWS', False) else sync_urlpatterns
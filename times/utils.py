@@ -1,43 +1,35 @@
-import json
 from datetime import date, datetime, timedelta
-from pathlib import Path
-from typing import Dict, Optional
-
-import pytz
+from typing import Dict, Iterator, List, Optional
 
 from .datamodels import PrayerTimes, PrayerEvent
+from .store import timetable_store
+from .timetable import (  # noqa: F401
+    COLUMNS, DATA_DIR, FAJR, ISHA, LANKA_TZ, MISSING, N_COLUMNS, TAHAJJUD,
+    day_index, load_table, night_point,
+)
+from .timing import timed
 
 PRAYERS = ["fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha"]
 
-BASE_DIR = Path(__file__).resolve().parent.parent  # project root
-DATA_DIR = BASE_DIR / 'prayer_api' / 'data_lk'
-
-LANKA_TZ = pytz.timezone('Asia/Colombo')
-
-# 🔑 Adjust this if your dataset year is fixed (e.g. 2025)
-SUPPORTED_YEAR = date.today().year
-
 
 class PrayerDataNotAvailable(Exception):
     """Raised when prayer data is not available for the requested date."""
     pass
 
 
-def load_table(madhab: str, city: str):
-    file_path = DATA_DIR / f"{madhab}.{city}.json"
-    with open(file_path, encoding='utf-8') as f:
-        return json.load(f)
-
-
 def minutes_to_hhmm(minutes: int) -> str:
     hours = minutes // 60
     minutes %= 60
     return f"{hours:02d}:{minutes:02d}"
 
+# Every clock time a timetable cell can hold, formatted once.
+HHMM = tuple(minutes_to_hhmm(m) for m in range(24 * 60))
+
 def hhmm_to_minutes(hhmm: str) -> int:
     h, m = map(int, hhmm.split(":"))
     return h * 60 + m
 
+@timed('lookup')
 def get_times_for_day(d: date, madhab: str, city: str, *, include_extras: bool = True) -> PrayerTimes:
     """
     Look up the prayer times for a given date, madhab, and city.
@@ -46,119 +38,224 @@ def get_times_for_day(d: date, madhab: str, city: str, *, include_extras: bool =
     - madhab: "hanafi" or "shafi"
     - city: "colombo" or "others"
 
-    Raises PrayerDataNotAvailable if the year is not supported.
+    Raises PrayerDataNotAvailable if there is no dataset for the year.
     """
 
-    if d.year != SUPPORTED_YEAR:
+    if not timetable_store.has_year(d.year):
         raise PrayerDataNotAvailable(
             f"No data available for year {d.year} in {madhab}.{city}"
         )
 
-    table = load_table(madhab, city)
-
-    # Calculating indices for month/day (JSON is zero-based, Python dates are one-based)
-    month_index = d.month - 1
-    day_index = d.day - 1
-
-    try:
-        times_in_minutes = table[month_index][day_index]
-    except IndexError:
+    row = timetable_store.table(madhab, city, d.year).row(d)
+    if row[FAJR] == MISSING:
         raise PrayerDataNotAvailable(
             f"No data available for {d} in {madhab}.{city}"
         )
 
-    times_dict: Dict[str, str] = {}
-    for i, prayer in enumerate(PRAYERS):
-        minutes = times_in_minutes[i]
-        times_dict[prayer] = minutes_to_hhmm(minutes)
-
-    tahajjud_val = None
-    midnight_val = None
-    if include_extras:
-        try:
-            next_day = d + timedelta(days=1)
-            if next_day.year == SUPPORTED_YEAR:
-                next_prayer_times = get_times_for_day(next_day, madhab, city, include_extras=False)
-                next_fajr_hhmm = next_prayer_times.fajr
-                maghrib_hhmm = times_dict['maghrib']
-                tahajjud_val = compute_tahajjud(maghrib_hhmm, next_fajr_hhmm)
-                midnight_val = compute_midnight(maghrib_hhmm, next_fajr_hhmm)
-        except Exception:
-            # Should only happen when data for next day's prayer times are not available
-            pass
+    fajr, sunrise, dhuhr, asr, maghrib, isha, tahajjud, midnight = row
+    has_extras = include_extras and tahajjud != MISSING
 
     return PrayerTimes(
         date=d,
         madhab=madhab,
         city=city,
-        tahajjud=tahajjud_val,
-        midnight=midnight_val,
-        **times_dict
+        fajr=HHMM[fajr],
+        sunrise=HHMM[sunrise],
+        dhuhr=HHMM[dhuhr],
+        asr=HHMM[asr],
+        maghrib=HHMM[maghrib],
+        isha=HHMM[isha],
+        tahajjud=HHMM[tahajjud] if has_extras else None,
+        midnight=HHMM[midnight] if has_extras else None,
     )
 
 
-def next_prayer(dt: datetime, times: PrayerTimes) -> Optional[PrayerEvent]:
-    if dt.tzinfo is None:
-        dt = LANKA_TZ.localize(dt)
-    else:
-        dt = dt.astimezone(LANKA_TZ)
+def _range_row(d: date, madhab: str, city: str, times: Dict[str, str]) -> Dict:
+    return {'date': d.isoformat(), 'madhab': madhab, 'city': city, 'times': times}
+
+
+def _range_block(start: date, end: date, madhab: str, city: str) -> List[Dict]:
+    """Rows for ``start..end``, which lie in the same dataset year."""
+    first, last = day_index(start), day_index(end)
+    table = timetable_store.table(madhab, city, start.year)
+    cells = table.data[first * N_COLUMNS:(last + 1) * N_COLUMNS]
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    if MISSING not in cells:
+        # One pass over the whole block; rows are then plain slices of it.
+        strings = list(map(HHMM.__getitem__, cells))
+        offsets = [(day_index(d) - first) * N_COLUMNS for d in days]
+        return [
+            _range_row(d, madhab, city, dict(zip(COLUMNS, strings[i:i + N_COLUMNS])))
+            for d, i in zip(days, offsets)
+        ]
+
+    rows = []
+    for d in days:
+        i = (day_index(d) - first) * N_COLUMNS
+        row = cells[i:i + N_COLUMNS]
+        if row[FAJR] == MISSING:
+            times = {'error': f"No data available for {d} in {madhab}.{city}"}
+        else:
+            width = N_COLUMNS if row[TAHAJJUD] != MISSING else ISHA + 1
+            times = {COLUMNS[c]: HHMM[row[c]] for c in range(width)}
+        rows.append(_range_row(d, madhab, city, times))
+    return rows
 
-    for name, hhmm in times.as_dict().items():
-        prayer_dt = LANKA_TZ.localize(
-            datetime.strptime(f'{times.date} {hhmm}', '%Y-%m-%d %H:%M')
-        )
-        if prayer_dt > dt:
-            return PrayerEvent(
-                given_datetime=dt,
-                name=name,
-                time=prayer_dt,
-                madhab=times.madhab,
-                city=times.city,
+
+@timed('lookup')
+def get_times_for_range(start: date, end: date, madhab: str, city: str) -> List[Dict]:
+    """
+    Prayer times for every day in ``start..end`` (inclusive), shaped like
+    ``PrayerTimesSerializer`` output. Days without data become rows whose
+    ``times`` is ``{'error': ...}``.
+    """
+    rows: List[Dict] = []
+    block_start = start
+    while block_start <= end:
+        block_end = min(end, date(block_start.year, 12, 31))
+        if timetable_store.has_year(block_start.year):
+            rows.extend(_range_block(block_start, block_end, madhab, city))
+        else:
+            message = f"No data available for year {block_start.year} in {madhab}.{city}"
+            rows.extend(
+                _range_row(block_start + timedelta(days=i), madhab, city, {'error': message})
+                for i in range((block_end - block_start).days + 1)
             )
-    return None
+        if block_end == date.max:
+            break
+        block_start = block_end + timedelta(days=1)
+    return rows
 
 
-def previous_prayer(dt: datetime, times: PrayerTimes) -> Optional[PrayerEvent]:
+def get_matrix_for_range(start: date, end: date, madhabs: List[str], cities: List[str]) -> List[Dict]:
+    """
+    ``get_times_for_range`` for every madhab and city at once: one row per
+    day, with ``times[madhab][city]`` holding that dataset's times (or its
+    ``{'error': ...}``).
+    """
+    columns = {
+        (madhab, city): get_times_for_range(start, end, madhab, city)
+        for madhab in madhabs for city in cities
+    }
+    return [
+        {
+            'date': (start + timedelta(days=i)).isoformat(),
+            'times': {
+                madhab: {city: columns[(madhab, city)][i]['times'] for city in cities}
+                for madhab in madhabs
+            },
+        }
+        for i in range((end - start).days + 1)
+    ]
+
+
+def iter_times_for_range(start: date, end: date, madhab: str, city: str,
+                         chunk_days: int) -> Iterator[List[Dict]]:
+    """
+    ``get_times_for_range`` in chunks of at most ``chunk_days`` rows, all
+    from the dataset snapshot current at the call, however late the chunks
+    are read.
+    """
+    return _chunks(timetable_store.current(), start, end, madhab, city, chunk_days)
+
+
+def _chunks(snapshot, start: date, end: date, madhab: str, city: str,
+            chunk_days: int) -> Iterator[List[Dict]]:
+    chunk_start = start
+    while True:
+        # Compared by span so the last chunk never steps past date.max.
+        if (end - chunk_start).days < chunk_days:
+            chunk_end = end
+        else:
+            chunk_end = chunk_start + timedelta(days=chunk_days - 1)
+        # Pinned per chunk: a generator may resume in another context.
+        with timetable_store.pinned(snapshot):
+            rows = get_times_for_range(chunk_start, chunk_end, madhab, city)
+        yield rows
+        if chunk_end == end:
+            return
+        chunk_start = chunk_end + timedelta(days=1)
+
+
+def lanka_today() -> date:
+    """Today's date in Sri Lanka, whatever the server's local timezone."""
+    return datetime.now(LANKA_TZ).date()
+
+
+def _to_lanka(dt: datetime) -> datetime:
     if dt.tzinfo is None:
-        dt = LANKA_TZ.localize(dt)
-    else:
-        dt = dt.astimezone(LANKA_TZ)
-
-    prev = None
-    for name, hhmm in times.as_dict().items():
-        prayer_dt = LANKA_TZ.localize(
-            datetime.strptime(f'{times.date} {hhmm}', '%Y-%m-%d %H:%M')
+        return LANKA_TZ.localize(dt)
+    return dt.astimezone(LANKA_TZ)
+
+
+@timed('lookup')
+def _events(dt: datetime, madhab: str, city: str, count: int, *, forward: bool) -> List[PrayerEvent]:
+    # Converting to Colombo time moves dt by a year at most, and overflows
+    # at the ends of the calendar, where there is never data.
+    if not any(timetable_store.has_year(dt.year + offset) for offset in (-1, 0, 1)):
+        raise PrayerDataNotAvailable(
+            f"No data available for year {dt.year} in {madhab}.{city}"
         )
-        if prayer_dt < dt:
-            prev = PrayerEvent(
-                given_datetime=dt,
-                name=name,
-                time=prayer_dt,
-                madhab=times.madhab,
-                city=times.city,
-            )
-        else:
-            break
-    return prev
+    dt = _to_lanka(dt)
+
+    # Walk consecutive dataset years away from dt. Going forward, the previous
+    # year comes first: its Dec 31 night runs into dt's year. Going back from
+    # a year without data, the previous year's last night may still cover dt.
+    ts = dt.timestamp()
+    step = 1 if forward else -1
+    has_year = timetable_store.has_year(dt.year)
+    year = dt.year - 1 if forward or not has_year else dt.year
+    if not timetable_store.has_year(year):
+        year = dt.year
+    found = []
+    while len(found) < count and timetable_store.has_year(year):
+        timeline = timetable_store.timeline(madhab, city, year)
+        found += (timeline.after if forward else timeline.before)(ts, count - len(found))
+        year += step
+    if not found and not has_year:
+        raise PrayerDataNotAvailable(
+            f"No data available for year {dt.year} in {madhab}.{city}"
+        )
+    return [
+        PrayerEvent(given_datetime=dt, name=event.name, time=event.time, madhab=madhab, city=city)
+        for event in found
+    ]
 
-def _night_span_minutes(maghrib_hhmm: str, next_fajr_hhmm: str) -> int:
+
+def upcoming_prayers(dt: datetime, madhab: str, city: str, count: int) -> List[PrayerEvent]:
     """
-    Night length in minutes from today's Maghrib to next day's Fajr.
+    The next ``count`` events (prayers, sunrise, tahajjud, midnight) after
+    ``dt``, across day boundaries. Fewer are returned at the end of the data.
     """
-    mag_m = hhmm_to_minutes(maghrib_hhmm)
-    fajr_next_m = 24 * 60 + hhmm_to_minutes(next_fajr_hhmm)
-    return fajr_next_m - mag_m
+    return _events(dt, madhab, city, count, forward=True)
+
+
+def upcoming_prayers_within(dt: datetime, madhab: str, city: str, hours: float) -> List[PrayerEvent]:
+    """Every event after ``dt`` and at most ``hours`` later, across day boundaries."""
+    # A day holds at most N_COLUMNS events; one extra day covers a partial one.
+    events = _events(dt, madhab, city, N_COLUMNS * (int(hours // 24) + 2), forward=True)
+    until = _to_lanka(dt) + timedelta(hours=hours)
+    return [event for event in events if event.time <= until]
+
+
+def next_prayer(dt: datetime, madhab: str, city: str) -> Optional[PrayerEvent]:
+    events = _events(dt, madhab, city, 1, forward=True)
+    return events[0] if events else None
+
+
+def previous_prayer(dt: datetime, madhab: str, city: str) -> Optional[PrayerEvent]:
+    events = _events(dt, madhab, city, 1, forward=False)
+    return events[0] if events else None
 
 def _point_before_fajr_fraction(maghrib_hhmm: str, next_fajr_hhmm: str, numerator: int, denominator: int) -> str:
     """
     Generic helper: returns the clock time that is (numerator/denominator) of the night
     BEFORE Fajr (e.g., 1/3 for tahajjud, 1/2 for midnight).
     """
-    night = _night_span_minutes(maghrib_hhmm, next_fajr_hhmm)
-    offset = (night * numerator) // denominator  # integer minutes
-    fajr_next_m = 24 * 60 + hhmm_to_minutes(next_fajr_hhmm)
-    target_m = (fajr_next_m - offset) % (24 * 60)
-    return minutes_to_hhmm(target_m)
+    return minutes_to_hhmm(night_point(
+        hhmm_to_minutes(maghrib_hhmm), hhmm_to_minutes(next_fajr_hhmm), numerator, denominator
+    ))
 
 def compute_tahajjud(maghrib_hhmm: str, next_fajr_hhmm: str) -> str:
     """
@@ -1,10 +1,13 @@
 from rest_framework.response import Response
 from rest_framework import status
 
+from .timing import timed
+
 VALID_MADHABS = {'hanafi', 'shafi'}
 VALID_CITIES = {'colombo', 'others'}
 
 
+@timed('validate')
 def validate_madhab_city(madhab: str, city: str):
     """Validate madhab and city. Returns (madhab, city, error_response)."""
     m = (madhab or 'shafi').lower()
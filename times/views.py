@@ -1,19 +1,53 @@
+import json
+import time
 from datetime import date, datetime, timedelta
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
 
-from .utils import get_times_for_day, next_prayer, PrayerDataNotAvailable
-from .validation import validate_madhab_city
-from .serializers import PrayerTimesSerializer, PrayerEventSerializer, PrayerTimesRangeSerializer
+from .bulk import bulk_payloads
+from .cache import day_body
+from .conditional import conditional, dataset_etag
+from .events import event_hub
+from .store import timetable_store
+from .timeline import local_midnight_epoch
+from .utils import (
+    get_matrix_for_range, get_times_for_range, iter_times_for_range, lanka_today, next_prayer,
+    upcoming_prayers, upcoming_prayers_within, PrayerDataNotAvailable,
+)
+from .ical import iter_calendar
+from .responses import ICalendarRenderer, NDJSONRenderer, TimesJSONResponse, render_body, render_json
+from .validation import VALID_CITIES, VALID_MADHABS, validate_madhab_city
+from .serializers import (
+    BatchQuerySerializer, BatchResponseSerializer, MatrixSerializer, PrayerEventSerializer,
+    PrayerTimesRangeSerializer, PrayerTimesSerializer, UpcomingEventsSerializer,
+)
+
+RANGE_MAX_DAYS = getattr(settings, 'TIMES_RANGE_MAX_DAYS', 10 * 366)
+RANGE_STREAM_MAX_DAYS = getattr(settings, 'TIMES_RANGE_STREAM_MAX_DAYS', 10 * 366)
+RANGE_STREAM_CHUNK_DAYS = getattr(settings, 'TIMES_RANGE_STREAM_CHUNK_DAYS', 31)
+MATRIX_MAX_DAYS = getattr(settings, 'TIMES_MATRIX_MAX_DAYS', 366)
+BATCH_MAX_QUERIES = getattr(settings, 'TIMES_BATCH_MAX_QUERIES', 100)
+BATCH_QUERY_TYPES = ('date', 'next')
+CALENDAR_MAX_AGE = getattr(settings, 'TIMES_CALENDAR_MAX_AGE', 6 * 60 * 60)
+UPCOMING_DEFAULT_COUNT = 8
+UPCOMING_MAX_COUNT = getattr(settings, 'TIMES_UPCOMING_MAX_COUNT', 100)
+UPCOMING_MAX_HOURS = getattr(settings, 'TIMES_UPCOMING_MAX_HOURS', 7 * 24)
 
 
 @extend_schema(
     summary='Get today’s prayer times',
-    description='Returns the prayer times for today for a given madhab and city.',
+    description='Returns the prayer times for today (Asia/Colombo) for a given madhab and city.',
     parameters=[
         OpenApiParameter(
             name='madhab',
@@ -34,23 +68,32 @@ from .serializers import PrayerTimesSerializer, PrayerEventSerializer, PrayerTim
 )
 @api_view(['GET'])
 def today_times(request):
-    madhab, city, error = validate_madhab_city(
-        request.query_params.get('madhab'),
-        request.query_params.get('city'),
-    )
+    return _today(request)
+
+
+def _today(request):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
     if error:
         return error
 
+    today = lanka_today()
     try:
-        prayer_times = get_times_for_day(date.today(), madhab, city)
+        # Rendered (usually a cache hit) before the validators are checked, so
+        # a day without data is a 404 rather than a 304.
+        body = day_body(today, madhab, city)
+        return conditional(
+            request,
+            lambda: TimesJSONResponse(rendered=body),
+            etag=dataset_etag('date', madhab, city, today),
+            expires=local_midnight_epoch(today + timedelta(days=1)),
+            last_modified=max(timetable_store.last_modified, local_midnight_epoch(today)),
+        )
     except PrayerDataNotAvailable as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({'error': str(e)}, status=HTTP_500_INTERNAL_SERVER_ERROR)
 
-    serializer = PrayerTimesSerializer(prayer_times)
-    return Response(serializer.data, status=status.HTTP_200_OK)
-
 
 @extend_schema(
     summary='Get prayer times for a specific date',
@@ -65,14 +108,16 @@ def today_times(request):
 )
 @api_view(['GET'])
 def date_times(request):
-    madhab, city, error = validate_madhab_city(
-        request.query_params.get('madhab'),
-        request.query_params.get('city'),
-    )
+    return _date(request)
+
+
+def _date(request):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
     if error:
         return error
 
-    date_str = request.query_params.get('date')
+    date_str = params.get('date')
     if not date_str:
         return Response(
             {'error': 'Missing "date" query param (YYYY-MM-DD)'},
@@ -81,7 +126,12 @@ def date_times(request):
 
     try:
         d = date.fromisoformat(date_str)
-        prayer_times = get_times_for_day(d, madhab, city)
+        body = day_body(d, madhab, city)  # as in _today(): a 404 before any 304
+        return conditional(
+            request,
+            lambda: TimesJSONResponse(rendered=body),
+            etag=dataset_etag('date', madhab, city, d),
+        )
     except ValueError:
         return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=HTTP_400_BAD_REQUEST)
     except PrayerDataNotAvailable as e:
@@ -89,13 +139,11 @@ def date_times(request):
     except Exception as e:
         return Response({'error': str(e)}, status=HTTP_500_INTERNAL_SERVER_ERROR)
 
-    serializer = PrayerTimesSerializer(prayer_times)
-    return Response(serializer.data, status=status.HTTP_200_OK)
-
 
 @extend_schema(
     summary='Get next prayer after a given datetime',
-    description='Provide a datetime in ISO8601 format (YYYY-MM-DDTHH:MM).',
+    description='Provide a datetime in ISO8601 format (YYYY-MM-DDTHH:MM). '
+                'The next event may fall on a later day, e.g. Fajr after Isha.',
     parameters=[
         OpenApiParameter('madhab', str, description='hanafi or shafi'),
         OpenApiParameter('city', str, description='colombo or others'),
@@ -107,14 +155,16 @@ def date_times(request):
 )
 @api_view(['GET'])
 def next_times(request):
-    madhab, city, error = validate_madhab_city(
-        request.query_params.get('madhab'),
-        request.query_params.get('city'),
-    )
+    return _next(request)
+
+
+def _next(request):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
     if error:
         return error
 
-    dt_str = request.query_params.get('datetime')
+    dt_str = params.get('datetime')
     if not dt_str:
         return Response(
             {'error': 'Missing "datetime" query param (ISO 8601 e.g. 2025-09-23T15:45)'},
@@ -123,8 +173,7 @@ def next_times(request):
 
     try:
         dt = datetime.fromisoformat(dt_str)
-        prayer_times = get_times_for_day(dt.date(), madhab, city)
-        next_prayer_event = next_prayer(dt, prayer_times)
+        next_prayer_event = next_prayer(dt, madhab, city)
     except ValueError:
         return Response({'error': 'Invalid datetime format. Use YYYY-MM-DDTHH:MM'}, status=HTTP_400_BAD_REQUEST)
     except PrayerDataNotAvailable as e:
@@ -133,29 +182,162 @@ def next_times(request):
         return Response({'error': str(e)}, status=HTTP_500_INTERNAL_SERVER_ERROR)
 
     if not next_prayer_event:
-        return Response({
-            'message': 'No prayers left today. Next is Fajr tomorrow.',
-            'given_datetime': dt_str,
-            'madhab': madhab,
-            'city': city,
-        }, status=status.HTTP_200_OK)
+        return Response(
+            {'error': f'No data available after {dt_str} in {madhab}.{city}'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    data = _next_payload(dt, madhab, city, next_prayer_event)
+    # The answer changes once the returned event has passed; answers about
+    # the past only change with the dataset.
+    expires = next_prayer_event.time.timestamp()
+    return conditional(
+        request,
+        lambda: TimesJSONResponse(data),
+        etag=dataset_etag('next', madhab, city, dt.isoformat()),
+        expires=expires if expires > time.time() else None,
+    )
+
+
+def _next_payload(dt: datetime, madhab: str, city: str, event) -> dict:
+    return {
+        'given_datetime': dt.isoformat(),
+        'madhab': madhab,
+        'city': city,
+        'next_prayer': _event_item(event),
+    }
+
+
+def _event_item(event) -> dict:
+    return {
+        'name': event.name,
+        'date': event.time.date().isoformat(),
+        'time': event.time.strftime("%H:%M"),
+    }
+
+
+@extend_schema(
+    summary='Get the upcoming events after a given datetime',
+    description='The next "count" events (prayers, sunrise, tahajjud and midnight) after the '
+                'datetime, or every event in the following "hours", across day, month and year '
+                f'boundaries. Pass one of count (1-{UPCOMING_MAX_COUNT}, default '
+                f'{UPCOMING_DEFAULT_COUNT}) or hours (up to {UPCOMING_MAX_HOURS}). Fewer events '
+                'are returned at the end of the data.',
+    parameters=[
+        OpenApiParameter('madhab', str, description='hanafi or shafi'),
+        OpenApiParameter('city', str, description='colombo or others'),
+        OpenApiParameter('datetime', str, required=True,
+                         description='Datetime in ISO8601 format (YYYY-MM-DDTHH:MM)',
+                         examples=[OpenApiExample('Example', value='2025-09-23T20:00')]),
+        OpenApiParameter('count', int, description='Number of events'),
+        OpenApiParameter('hours', float, description='Length of the window in hours'),
+    ],
+    responses={200: UpcomingEventsSerializer},
+)
+@api_view(['GET'])
+def upcoming_times(request):
+    return _upcoming(request)
+
+
+def _upcoming(request):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
+    if error:
+        return error
+
+    dt_str = params.get('datetime')
+    if not dt_str:
+        return Response(
+            {'error': 'Missing "datetime" query param (ISO 8601 e.g. 2025-09-23T15:45)'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+    count_str, hours_str = params.get('count'), params.get('hours')
+    if count_str is not None and hours_str is not None:
+        return Response({'error': 'Pass either "count" or "hours", not both'}, status=HTTP_400_BAD_REQUEST)
+
+    try:
+        count = int(count_str) if count_str is not None else UPCOMING_DEFAULT_COUNT
+    except ValueError:
+        count = 0
+    if not 1 <= count <= UPCOMING_MAX_COUNT:
+        return Response(
+            {'error': f'"count" must be an integer from 1 to {UPCOMING_MAX_COUNT}'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+    try:
+        hours = float(hours_str) if hours_str is not None else None
+    except ValueError:
+        hours = -1.0
+    if hours is not None and not 0 < hours <= UPCOMING_MAX_HOURS:
+        return Response(
+            {'error': f'"hours" must be a number above 0 and at most {UPCOMING_MAX_HOURS}'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        dt = datetime.fromisoformat(dt_str)
+        if hours is None:
+            events = upcoming_prayers(dt, madhab, city, count)
+        else:
+            events = upcoming_prayers_within(dt, madhab, city, hours)
+    except ValueError:
+        return Response({'error': 'Invalid datetime format. Use YYYY-MM-DDTHH:MM'}, status=HTTP_400_BAD_REQUEST)
+    except PrayerDataNotAvailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return Response({'error': str(e)}, status=HTTP_500_INTERNAL_SERVER_ERROR)
+
+    if not events and hours is None:
+        return Response(
+            {'error': f'No data available after {dt_str} in {madhab}.{city}'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
 
     data = {
         'given_datetime': dt.isoformat(),
         'madhab': madhab,
         'city': city,
-        'next_prayer': {
-            'name': next_prayer_event.name,
-            'time': next_prayer_event.time.strftime("%H:%M"),
-        }
+        'events': [_event_item(event) for event in events],
     }
-    serializer = PrayerEventSerializer(data)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # As with /next/: fresh until the first returned event arrives.
+    expires = events[0].time.timestamp() if events else None
+    window = ('hours', hours) if hours is not None else ('count', count)
+    return conditional(
+        request,
+        lambda: TimesJSONResponse(data),
+        etag=dataset_etag('upcoming', madhab, city, dt.isoformat(), *window),
+        expires=expires if expires and expires > time.time() else None,
+    )
+
+
+@extend_schema(
+    summary='Stream prayer time transitions as server-sent events',
+    description='Keeps the connection open and pushes text/event-stream messages: "next" '
+                'announces the coming event, "prayer" is sent when it is reached (its id is the '
+                'event epoch, so a reconnect with Last-Event-ID replays missed prayers), and '
+                'comment heartbeats keep idle connections alive. Served only by the ASGI '
+                'deployment (prayer_api.asgi); the WSGI one answers 501.',
+    parameters=[
+        OpenApiParameter('madhab', str, description='hanafi or shafi'),
+        OpenApiParameter('city', str, description='colombo or others'),
+    ],
+    responses={(200, 'text/event-stream'): OpenApiTypes.STR, 501: dict},
+)
+@api_view(['GET'])
+def events_times(request):
+    # A sync worker would be held by each open stream for as long as the
+    # client stays connected.
+    return Response(
+        {'error': 'Server-sent events need the ASGI server: uvicorn prayer_api.asgi:application'},
+        status=status.HTTP_501_NOT_IMPLEMENTED,
+    )
 
 
 @extend_schema(
     summary='Get prayer times for a date range',
-    description='Provide start and end dates (YYYY-MM-DD).',
+    description='Provide start and end dates (YYYY-MM-DD), at most '
+                f'{RANGE_MAX_DAYS} days apart. With format=ndjson (or Accept: application/x-ndjson) '
+                f'the days are streamed as one JSON object per line, up to {RANGE_STREAM_MAX_DAYS} days.',
     parameters=[
         OpenApiParameter(name='madhab', description='hanafi or shafi', type=str),
         OpenApiParameter(name='city', description='colombo or others', type=str),
@@ -165,16 +347,20 @@ def next_times(request):
     responses={200: PrayerTimesRangeSerializer},
 )
 @api_view(['GET'])
+@renderer_classes([*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer])
 def range_times(request):
-    madhab, city, error = validate_madhab_city(
-        request.query_params.get('madhab'),
-        request.query_params.get('city'),
-    )
+    ndjson = request.accepted_renderer.format == NDJSONRenderer.format
+    return _range(request, ndjson)
+
+
+def _range(request, ndjson: bool, asynchronous: bool = False):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
     if error:
         return error
 
-    start_str = request.query_params.get('start')
-    end_str = request.query_params.get('end')
+    start_str = params.get('start')
+    end_str = params.get('end')
     if not start_str or not end_str:
         return Response(
             {'error': 'Missing "start" or "end" query params (YYYY-MM-DD)'},
@@ -189,33 +375,431 @@ def range_times(request):
     except ValueError:
         return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=HTTP_400_BAD_REQUEST)
 
-    results = []
-    current = start_date
-    while current <= end_date:
-        try:
-            pt = get_times_for_day(current, madhab, city)
-            results.append(pt)
-        except PrayerDataNotAvailable as e:
-            results.append({
-                'date': str(current),
-                'madhab': madhab,
-                'city': city,
-                'times': {'error': str(e)}
+    if ndjson:
+        return _stream_range(request, start_date, end_date, madhab, city, asynchronous)
+
+    # The body is built in one go, on the event loop under ASGI.
+    span = (end_date - start_date).days + 1
+    if span > RANGE_MAX_DAYS:
+        return Response(
+            {'error': f'Range too long: {span} days (max {RANGE_MAX_DAYS})'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    def render():
+        return TimesJSONResponse({
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'madhab': madhab,
+            'city': city,
+            'results': get_times_for_range(start_date, end_date, madhab, city),
+        })
+
+    try:
+        return conditional(request, render, etag=dataset_etag('range', madhab, city, start_date, end_date))
+    except Exception as e:
+        return Response({'error': str(e)}, status=HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _stream_range(request, start_date: date, end_date: date, madhab: str, city: str,
+                  asynchronous: bool = False):
+    """
+    NDJSON body produced a chunk of days at a time, so memory stays flat.
+    Under ASGI the chunks come from an async generator, which Django can
+    stream without collecting a sync iterator in a worker thread first.
+    """
+    span = (end_date - start_date).days + 1
+    if span > RANGE_STREAM_MAX_DAYS:
+        return Response(
+            {'error': f'Range too long for streaming: {span} days (max {RANGE_STREAM_MAX_DAYS})'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    def lines(chunks):
+        for rows in chunks:
+            yield b''.join(render_json(row) + b'\n' for row in rows)
+
+    def render():
+        body = lines(iter_times_for_range(start_date, end_date, madhab, city, RANGE_STREAM_CHUNK_DAYS))
+        return StreamingHttpResponse(_async_chunks(body) if asynchronous else body,
+                                     content_type=NDJSONRenderer.media_type)
+
+    return conditional(
+        request,
+        render,
+        etag=dataset_etag('range.ndjson', madhab, city, start_date, end_date),
+    )
+
+
+async def _async_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@extend_schema(
+    summary='Export prayer times as an iCalendar (.ics) feed',
+    description='One event per prayer (and sunrise) per day between start and end, which '
+                'default to the first and last day of the loaded data. Streamed in constant '
+                'memory, and revalidated with the same ETags as the data, so a calendar '
+                'subscription refreshing every few hours mostly gets 304 Not Modified.',
+    parameters=[
+        OpenApiParameter('madhab', str, description='hanafi or shafi'),
+        OpenApiParameter('city', str, description='colombo or others'),
+        OpenApiParameter('start', str, description='Start date YYYY-MM-DD'),
+        OpenApiParameter('end', str, description='End date YYYY-MM-DD'),
+    ],
+    responses={(200, ICalendarRenderer.media_type): OpenApiTypes.STR},
+)
+@api_view(['GET'])
+@renderer_classes([*api_settings.DEFAULT_RENDERER_CLASSES, ICalendarRenderer])
+def calendar_times(request):
+    # Errors are JSON whatever the Accept header.
+    return _as_json(_calendar(request))
+
+
+def _calendar(request, asynchronous: bool = False):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
+    if error:
+        return error
+
+    years = timetable_store.years
+    if not years:
+        return Response({'error': 'No prayer time data is loaded'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        start_date = date.fromisoformat(params['start']) if params.get('start') else date(years[0], 1, 1)
+        end_date = date.fromisoformat(params['end']) if params.get('end') else date(years[-1], 12, 31)
+    except ValueError:
+        return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=HTTP_400_BAD_REQUEST)
+    if end_date < start_date:
+        return Response({'error': '"end" must not be earlier than "start"'}, status=HTTP_400_BAD_REQUEST)
+    span = (end_date - start_date).days + 1
+    if span > RANGE_STREAM_MAX_DAYS:
+        return Response(
+            {'error': f'Range too long: {span} days (max {RANGE_STREAM_MAX_DAYS})'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    def render():
+        chunks = iter_calendar(
+            start_date, end_date, madhab, city, chunk_days=RANGE_STREAM_CHUNK_DAYS,
+            refresh_seconds=CALENDAR_MAX_AGE, last_modified=timetable_store.last_modified,
+        )
+        response = StreamingHttpResponse(_async_chunks(chunks) if asynchronous else chunks,
+                                         content_type=f'{ICalendarRenderer.media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="prayer-times-{madhab}-{city}.ics"'
+        return response
+
+    # Not immutable like /range/: subscribers should pick up dataset
+    # corrections, and a revalidation is a 304.
+    return conditional(
+        request,
+        render,
+        etag=dataset_etag('calendar', madhab, city, start_date, end_date),
+        expires=time.time() + CALENDAR_MAX_AGE,
+    )
+
+
+@extend_schema(
+    summary='Get prayer times for every madhab and city',
+    description='Pass a date, or start and end dates (YYYY-MM-DD), to get the times of every '
+                'madhab and city side by side: results[i].times[madhab][city]. At most '
+                f'{MATRIX_MAX_DAYS} days per request.',
+    parameters=[
+        OpenApiParameter('date', str, description='Date in YYYY-MM-DD format'),
+        OpenApiParameter('start', str, description='Start date YYYY-MM-DD, with end instead of date'),
+        OpenApiParameter('end', str, description='End date YYYY-MM-DD'),
+    ],
+    responses={200: MatrixSerializer},
+)
+@api_view(['GET'])
+def matrix_times(request):
+    return _matrix(request)
+
+
+def _matrix(request):
+    params = request.GET
+    date_str = params.get('date')
+    start_str = params.get('start')
+    end_str = params.get('end')
+    if date_str and (start_str or end_str):
+        return Response({'error': 'Pass either "date" or "start" and "end", not both'},
+                        status=HTTP_400_BAD_REQUEST)
+    if not date_str and not (start_str and end_str):
+        return Response(
+            {'error': 'Missing "date" or "start" and "end" query params (YYYY-MM-DD)'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        start_date = date.fromisoformat(date_str or start_str)
+        end_date = date.fromisoformat(date_str or end_str)
+    except ValueError:
+        return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=HTTP_400_BAD_REQUEST)
+    if end_date < start_date:
+        return Response({'error': '"end" must not be earlier than "start"'}, status=HTTP_400_BAD_REQUEST)
+    span = (end_date - start_date).days + 1
+    if span > MATRIX_MAX_DAYS:
+        return Response(
+            {'error': f'Range too long: {span} days (max {MATRIX_MAX_DAYS})'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+    if date_str and not timetable_store.has_year(start_date.year):
+        # As /date/ answers; a range gets error rows, as /range/ does.
+        return Response({'error': f'No data available for year {start_date.year}'},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    # Whatever times.validation accepts, so new cities and madhabs show up here.
+    madhabs, cities = sorted(VALID_MADHABS), sorted(VALID_CITIES)
+
+    def render():
+        return TimesJSONResponse({
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'madhabs': madhabs,
+            'cities': cities,
+            'results': get_matrix_for_range(start_date, end_date, madhabs, cities),
+        })
+
+    try:
+        return conditional(request, render, etag=dataset_etag('matrix', *madhabs, *cities, start_date, end_date))
+    except Exception as e:
+        return Response({'error': str(e)}, status=HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _bulk_parameters(*extra):
+    return [
+        OpenApiParameter('madhab', str, description='hanafi or shafi'),
+        OpenApiParameter('city', str, description='colombo or others'),
+        OpenApiParameter('year', int, required=True, description='Dataset year, e.g. 2026'),
+        *extra,
+    ]
+
+
+@extend_schema(
+    summary='Get prayer times for a whole year',
+    description='The /range/ body for 1 January to 31 December, rendered once per dataset and '
+                'sent gzip or brotli encoded when the client accepts it.',
+    parameters=_bulk_parameters(),
+    responses={200: PrayerTimesRangeSerializer},
+)
+@api_view(['GET'])
+def year_times(request):
+    return _bulk(request, monthly=False)
+
+
+@extend_schema(
+    summary='Get prayer times for a whole month',
+    description='The /range/ body for every day of the month, rendered once per dataset and '
+                'sent gzip or brotli encoded when the client accepts it.',
+    parameters=_bulk_parameters(OpenApiParameter('month', int, required=True, description='1 to 12')),
+    responses={200: PrayerTimesRangeSerializer},
+)
+@api_view(['GET'])
+def month_times(request):
+    return _bulk(request, monthly=True)
+
+
+def _bulk(request, monthly: bool):
+    params = request.GET
+    madhab, city, error = validate_madhab_city(params.get('madhab'), params.get('city'))
+    if error:
+        return error
+
+    try:
+        year = int(params['year'])
+        month = int(params['month']) if monthly else None
+    except (KeyError, ValueError):
+        missing = '"year" or "month" query params' if monthly else '"year" query param'
+        return Response({'error': f'Missing or invalid {missing}'}, status=HTTP_400_BAD_REQUEST)
+    if monthly and not 1 <= month <= 12:
+        return Response({'error': '"month" must be from 1 to 12'}, status=HTTP_400_BAD_REQUEST)
+    if not timetable_store.has_year(year):
+        return Response(
+            {'error': f'No data available for year {year} in {madhab}.{city}'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    encoding, body = bulk_payloads.get(madhab, city, year, month).best(
+        request.headers.get('Accept-Encoding', ''))
+    etag = dataset_etag('month' if monthly else 'year', madhab, city, year, month)
+    if encoding:
+        # Each representation needs its own strong validator.
+        etag = f'{etag[:-1]}-{encoding}"'
+
+    def render():
+        response = TimesJSONResponse(rendered=body)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        return response
+
+    response = conditional(request, render, etag=etag)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+@extend_schema(
+    summary='Answer many date and next-prayer lookups in one request',
+    description='POST a JSON array of queries, each {"type": "date" | "next", "madhab", "city", '
+                'and "date" (YYYY-MM-DD) or "datetime" (ISO 8601)}. Results come back in input '
+                'order, each with the status the single endpoint would have returned and either '
+                f'its "data" or an "error". At most {BATCH_MAX_QUERIES} queries per request.',
+    request=BatchQuerySerializer(many=True),
+    responses={200: BatchResponseSerializer},
+)
+@api_view(['POST'])
+def batch_times(request):
+    return _batch(request.data)
+
+
+def _batch(queries):
+    if not isinstance(queries, list):
+        return Response({'error': 'Expected a JSON array of queries'}, status=HTTP_400_BAD_REQUEST)
+    if len(queries) > BATCH_MAX_QUERIES:
+        return Response(
+            {'error': f'Too many queries: {len(queries)} (max {BATCH_MAX_QUERIES})'},
+            status=HTTP_400_BAD_REQUEST,
+        )
+    # /date/ results reuse the cached bodies, so the response is spliced
+    # together from bytes rather than rendered as one object.
+    return TimesJSONResponse(rendered=b'{"results":[' + b','.join(map(_batch_item, queries)) + b']}')
+
+
+def _batch_error(status_code: int, data: dict) -> bytes:
+    return render_json({'status': status_code, **data})
+
+
+def _batch_item(query) -> bytes:
+    if not isinstance(query, dict):
+        return _batch_error(HTTP_400_BAD_REQUEST, {'error': 'Each query must be an object'})
+    kind = query.get('type')
+    if kind not in BATCH_QUERY_TYPES:
+        return _batch_error(HTTP_400_BAD_REQUEST, {
+            'error': f'Invalid type: {kind}',
+            'valid_values': list(BATCH_QUERY_TYPES),
+        })
+
+    madhab, city = (query.get(key) for key in ('madhab', 'city'))
+    madhab, city, error = validate_madhab_city(
+        madhab if madhab is None else str(madhab),
+        city if city is None else str(city),
+    )
+    if error:
+        return _batch_error(error.status_code, error.data)
+
+    try:
+        if kind == 'date':
+            if not isinstance(query.get('date'), str):
+                return _batch_error(HTTP_400_BAD_REQUEST, {'error': 'Missing "date" (YYYY-MM-DD)'})
+            try:
+                d = date.fromisoformat(query['date'])
+            except ValueError:
+                return _batch_error(HTTP_400_BAD_REQUEST, {'error': 'Invalid date format. Use YYYY-MM-DD'})
+            return b'{"status":200,"data":' + day_body(d, madhab, city) + b'}'
+
+        dt_str = query.get('datetime')
+        if not isinstance(dt_str, str):
+            return _batch_error(HTTP_400_BAD_REQUEST, {
+                'error': 'Missing "datetime" (ISO 8601 e.g. 2025-09-23T15:45)',
             })
-        except Exception as e:
-            results.append({
-                'date': str(current),
-                'madhab': madhab,
-                'city': city,
-                'times': {'error': str(e)}
+        try:
+            dt = datetime.fromisoformat(dt_str)
+        except ValueError:
+            return _batch_error(HTTP_400_BAD_REQUEST, {'error': 'Invalid datetime format. Use YYYY-MM-DDTHH:MM'})
+        event = next_prayer(dt, madhab, city)
+        if not event:
+            return _batch_error(status.HTTP_404_NOT_FOUND, {
+                'error': f'No data available after {dt_str} in {madhab}.{city}',
             })
-        current += timedelta(days=1)
+        return render_body({'status': status.HTTP_200_OK, 'data': _next_payload(dt, madhab, city, event)})
+    except PrayerDataNotAvailable as e:
+        return _batch_error(status.HTTP_404_NOT_FOUND, {'error': str(e)})
+    except Exception as e:
+        return _batch_error(HTTP_500_INTERNAL_SERVER_ERROR, {'error': str(e)})
 
-    serializer = PrayerTimesRangeSerializer({
-        'start': start_date,
-        'end': end_date,
-        'madhab': madhab,
-        'city': city,
-        'results': results,
-    })
-    return Response(serializer.data, status=status.HTTP_200_OK)
+
+# Async twins of the views above, routed instead of them when
+# TIMES_ASYNC_VIEWS is set (see times/urls.py). They run the same code
+# directly on the event loop: every lookup is in-memory and CPU-bound, so
+# there is nothing to await and no reason to hop to a worker thread. DRF
+# views are sync-only, so these are plain Django views: the shared code
+# reads request.GET (which DRF's query_params is) and error Responses are
+# rendered as JSON here.
+
+def _as_json(response):
+    if isinstance(response, Response):
+        return TimesJSONResponse(response.data, status=response.status_code)
+    return response
+
+
+def _wants_ndjson(request) -> bool:
+    return (request.GET.get(api_settings.URL_FORMAT_OVERRIDE) == NDJSONRenderer.format
+            or NDJSONRenderer.media_type in request.headers.get('Accept', ''))
+
+
+@require_GET
+async def today_times_async(request):
+    return _as_json(_today(request))
+
+
+@require_GET
+async def date_times_async(request):
+    return _as_json(_date(request))
+
+
+@require_GET
+async def next_times_async(request):
+    return _as_json(_next(request))
+
+
+@require_GET
+async def upcoming_times_async(request):
+    return _as_json(_upcoming(request))
+
+
+@require_GET
+async def events_times_async(request):
+    madhab, city, error = validate_madhab_city(request.GET.get('madhab'), request.GET.get('city'))
+    if error:
+        return _as_json(error)
+    return StreamingHttpResponse(
+        event_hub.stream(madhab, city, request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream',
+        # Also keeps nginx from buffering the stream.
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@require_GET
+async def calendar_times_async(request):
+    return _as_json(_calendar(request, asynchronous=True))
+
+
+@require_GET
+async def matrix_times_async(request):
+    return _as_json(_matrix(request))
+
+
+@require_GET
+async def year_times_async(request):
+    return _as_json(_bulk(request, monthly=False))
+
+
+@require_GET
+async def month_times_async(request):
+    return _as_json(_bulk(request, monthly=True))
+
+
+@require_GET
+async def range_times_async(request):
+    return _as_json(_range(request, _wants_ndjson(request), asynchronous=True))
+
+
+@csrf_exempt  # as DRF views are
+@require_POST
+async def batch_times_async(request):
+    try:
+        queries = json.loads(request.body)
+    except ValueError as e:
+        return TimesJSONResponse({'error': f'JSON parse error - {e}'}, status=HTTP_400_BAD_REQUEST)
+    return _as_json(_batch(queries))